@@ -0,0 +1,201 @@
+import numpy as np
+import pandas as pd
+
+from schema import COUNTRY_DTYPE, SPORT_DTYPE
+from sketches import SketchWindow
+
+MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December']
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+class LogAggregates:
+    """
+    Running counters behind the dashboard panels.
+
+    Rows are added as they arrive and subtracted as they leave the window, so
+    each panel reads a precomputed aggregate whose size depends on the number of
+    categories rather than the number of rows.
+
+    Frames passed to add/remove are expected to come from ingest.prepare_logs,
+    which adds the Device, Browser and time bucket columns counted here.
+
+    Unique IPs and response time percentiles come from sketches, which cannot
+    subtract rows; they cover the newest batches spanning `window_rows` rows.
+
+    Parameters:
+    window_rows (int): Rows in the dashboard window, or None to sketch every added row.
+    """
+
+    # Counter name -> columns it is grouped by
+    COUNTERS = {
+        'Sport': ['Sport'],
+        'Country': ['Country'],
+        'Device': ['Device'],
+        'Browser': ['Browser'],
+        'Status_Code': ['Status_Code'],
+        'Country_Sport': ['Country', 'Sport'],
+        'Date': ['Date'],
+        'Month': ['Month'],
+        'Month_Sport': ['Month', 'Sport'],
+        'Hour_DayOfWeek': ['Hour', 'DayOfWeek'],
+    }
+
+    def __init__(self, window_rows=None):
+        self.rows = 0
+        self.time_elapsed_total = 0
+        self._counts = {name: None for name in self.COUNTERS}
+        self.sketches = SketchWindow(window_rows)
+
+    def add(self, frame):
+        self._update(frame, 1)
+        self.sketches.add(frame)
+
+    def remove(self, frame):
+        self._update(frame, -1)
+
+    def update(self, added, evicted):
+        """
+        Applies one window step: rows added and rows evicted.
+        """
+        if not evicted.empty and len(evicted) >= self.rows:
+            # Every counted row leaves (e.g. the window was replaced), so the sketch buckets go too
+            self.sketches.clear()
+        self.add(added)
+        self.remove(evicted)
+
+    def _update(self, frame, sign):
+        if frame.empty:
+            return
+        for name, columns in self.COUNTERS.items():
+            counts = frame.groupby(columns, observed=True).size() * sign
+            current = self._counts[name]
+            if current is not None and not current.empty:
+                counts = current.add(counts, fill_value=0)
+            self._counts[name] = counts[counts != 0].astype('int64')
+        self.rows += sign * len(frame)
+        self.time_elapsed_total += sign * int(frame['Time_Elapsed'].sum())
+
+    def counts(self, name):
+        """
+        Returns the counter as a Series sorted like value_counts, most frequent first.
+        """
+        counts = self._counts[name]
+        if counts is None:
+            return pd.Series(dtype='int64', name='count')
+        return counts.sort_values(ascending=False, kind='stable').rename('count')
+
+    def summary(self):
+        return dict(
+            self.sketches.merged().summary(),
+            visits=self.rows,
+            avg_response_time=self.time_elapsed_total / self.rows if self.rows else float('nan'),
+            countries=len(self.counts('Country')),
+        )
+
+    def sport_counts_for(self, country):
+        counts = self.counts('Country_Sport')
+        if counts.empty or country not in counts.index.get_level_values(0):
+            return pd.Series(dtype='int64', name='count')
+        return counts.xs(country, level=0).sort_values(ascending=False, kind='stable')
+
+    def daily_views(self):
+        counts = self.counts('Date').sort_index()
+        return pd.DataFrame({'Date': counts.index, 'Views': counts.values})
+
+    def monthly_views(self):
+        counts = self.counts('Month').sort_index()
+        months = pd.DatetimeIndex(counts.index)
+        return pd.DataFrame({
+            'Month': [MONTH_NAMES[month - 1] for month in months.month],
+            'Year': months.year,
+            'Views': counts.values,
+        })
+
+    def sport_trend(self, sports):
+        counts = self.counts('Month_Sport')
+        if counts.empty:
+            return pd.DataFrame(columns=['Date', 'Sport', 'Views'])
+        counts = counts[counts.index.get_level_values('Sport').isin(sports)].sort_index()
+        return pd.DataFrame({
+            'Date': counts.index.get_level_values('Month'),
+            'Sport': counts.index.get_level_values('Sport'),
+            'Views': counts.values,
+        })
+
+    def heatmap(self):
+        """
+        Returns views as an Hour x DayOfWeek table, with days ordered Monday to Sunday.
+        """
+        counts = self.counts('Hour_DayOfWeek')
+        if counts.empty:
+            return pd.DataFrame(columns=DAY_NAMES)
+        table = counts.unstack('DayOfWeek').sort_index().reindex(columns=range(7))
+        table.columns = DAY_NAMES
+        return table.dropna(axis=1, how='all')
+
+
+class ServerStats:
+    """
+    Read-only view over a /stats response from log_server.py, with the same panel
+    accessors as LogAggregates so the dashboard can render from either.
+
+    Parameters:
+    stats (dict): The decoded /stats JSON.
+    """
+
+    # Counter name -> /stats panel
+    PANELS = {
+        'Sport': 'sports',
+        'Country': 'countries',
+        'Device': 'devices',
+        'Browser': 'browsers',
+        'Status_Code': 'status_codes',
+    }
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def counts(self, name):
+        counts = self.stats.get(self.PANELS[name], {})
+        index = [int(key) for key in counts] if name == 'Status_Code' else list(counts)
+        series = pd.Series(list(counts.values()), index=pd.Index(index, name=name), dtype='int64', name='count')
+        return series.sort_values(ascending=False, kind='stable')
+
+    def summary(self):
+        summary = dict(self.stats.get('sketches', {}), **self.stats['summary'])
+        average = summary['avg_response_time']
+        return dict(summary, avg_response_time=float('nan') if average is None else average)
+
+    def sport_counts_for(self, country):
+        code = COUNTRY_DTYPE.categories.get_indexer([country])[0]
+        if code < 0:
+            return pd.Series(dtype='int64', name='count')
+        counts = pd.Series(self.stats['country_sports'][code], index=pd.Index(SPORT_DTYPE.categories, name='Sport'), name='count')
+        return counts[counts != 0].sort_values(ascending=False, kind='stable')
+
+    def daily_views(self):
+        daily = self.stats['daily']
+        return pd.DataFrame({'Date': pd.to_datetime(daily['Date'], format='%Y-%m-%d').astype('datetime64[s]'), 'Views': daily['Views']})
+
+    def monthly_views(self):
+        monthly = self.stats['monthly']
+        months = pd.DatetimeIndex(pd.to_datetime(monthly['Month'], format='%Y-%m'))
+        return pd.DataFrame({
+            'Month': [MONTH_NAMES[month - 1] for month in months.month],
+            'Year': months.year,
+            'Views': monthly['Views'],
+        })
+
+    def sport_trend(self, sports):
+        trend = pd.DataFrame(self.stats['month_sports'], columns=['Month', 'Sport', 'Views'])
+        trend = trend[trend['Sport'].isin(sports)]
+        return pd.DataFrame({
+            'Date': pd.to_datetime(trend['Month'], format='%Y-%m').astype('datetime64[s]'),
+            'Sport': trend['Sport'],
+            'Views': trend['Views'],
+        }).reset_index(drop=True)
+
+    def heatmap(self):
+        table = pd.DataFrame(np.array(self.stats['heatmap']).reshape(24, 7), columns=DAY_NAMES)
+        table.index.name = 'Hour'
+        return table.loc[:, table.any()]
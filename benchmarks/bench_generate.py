@@ -0,0 +1,43 @@
+"""
+Compares the per-row log generator with the vectorized batch generator.
+
+Run from the repository root:
+    python -m benchmarks.bench_generate [num_logs ...]
+"""
+import sys
+
+import pandas as pd
+
+from benchmarks.common import result, time_call
+from log_server import generate_log_columns, generate_sample_logs, generate_sample_logs_batch
+
+
+def run(sizes, repeat=3):
+    """
+    Returns benchmark records for the per-row generator, the batch generator and
+    the raw column generator the log producer uses.
+    """
+    generators = {
+        'generate.per_row': lambda num_logs: pd.DataFrame(generate_sample_logs(num_logs)),
+        'generate.batch': generate_sample_logs_batch,
+        'generate.columns': generate_log_columns,
+    }
+    results = []
+    for num_logs in sizes:
+        for name, generate in generators.items():
+            timing = time_call(lambda: generate(num_logs), repeat)
+            results.append(result(name, dict(timing, rows_per_s=num_logs / timing['best_s']), rows=num_logs))
+    return results
+
+
+def main(sizes):
+    results = {(record['name'], record['params']['rows']): record['best_s'] for record in run(sizes)}
+    print(f"{'rows':>10} {'per-row (s)':>12} {'batch (s)':>12} {'speedup':>8}")
+    for num_logs in sizes:
+        per_row = results['generate.per_row', num_logs]
+        batch = results['generate.batch', num_logs]
+        print(f"{num_logs:>10} {per_row:>12.4f} {batch:>12.4f} {per_row / batch:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,79 @@
+"""
+Per-stage compute time of the dashboard's refresh loop in main.py.
+
+Uses Funolympics_data.csv (repeated up to the requested number of rows) as the
+window, and times each ingest stage (user agent classification, timestamp
+parsing, prepare_logs), the incremental aggregate updates, and for every panel
+reading its aggregate, building its figure and updating that figure in place.
+
+Run from the repository root:
+    python -m benchmarks.bench_panels [num_rows]
+"""
+import sys
+
+from aggregates import LogAggregates
+from benchmarks.common import load_snapshot, result, time_call
+import figures
+from ingest import parse_timestamps, prepare_logs, time_buckets
+from ua_classifier import classify_user_agent, classify_user_agents
+
+# Panel -> (aggregate read, figure build, in-place figure update or None)
+PANELS = {
+    'interests': (lambda aggregates: aggregates.counts('Sport').reset_index().set_axis(['Sport', 'Count'], axis=1),
+                  lambda data: figures.interests_bar(data, 'Main Interests'), figures.update_interests_bar),
+    'geo': (lambda aggregates: aggregates.counts('Country').reset_index().set_axis(['Country', 'Views'], axis=1),
+            figures.geo_map, figures.update_geo_map),
+    'device': (lambda aggregates: aggregates.counts('Device'), figures.device_pie, figures.update_pie),
+    'status': (lambda aggregates: aggregates.counts('Status_Code'), figures.status_pie, figures.update_pie),
+    'browser': (lambda aggregates: aggregates.counts('Browser'), figures.browser_pie, figures.update_pie),
+    'trend': (lambda aggregates: aggregates.daily_views(), lambda data: figures.trend_line(data, 'Date'),
+              lambda fig, data: figures.update_trend_line(fig, data, 'Date')),
+    'sports': (lambda aggregates: aggregates.sport_trend(aggregates.counts('Sport').index[:5]), figures.sports_trend_lines, None),
+    'heatmap': (lambda aggregates: aggregates.heatmap(), figures.heatmap, figures.update_heatmap),
+}
+
+
+def _classify_cold(user_agents):
+    classify_user_agent.cache_clear()
+    return classify_user_agents(user_agents)
+
+
+def run(num_rows=None, batch_rows=1000, repeat=5):
+    """
+    Returns benchmark records for the ingest stages, aggregate updates and every panel.
+    """
+    logs_df = load_snapshot(num_rows)
+    rows = len(logs_df)
+    prepared = prepare_logs(logs_df)
+    batch = prepared.head(batch_rows)
+    results = [
+        result('panels.user_agents', time_call(lambda: _classify_cold(logs_df['User_Agent']), repeat), rows=rows, cache='cold'),
+        result('panels.user_agents', time_call(lambda: classify_user_agents(logs_df['User_Agent']), repeat), rows=rows, cache='warm'),
+        result('panels.timestamps', time_call(lambda: time_buckets(parse_timestamps(logs_df['Timestamp'])), repeat), rows=rows),
+        result('panels.prepare_logs', time_call(lambda: prepare_logs(logs_df), repeat), rows=rows),
+        result('panels.aggregates_full', time_call(lambda: LogAggregates().add(prepared), repeat), rows=rows),
+    ]
+    aggregates = LogAggregates()
+    aggregates.add(prepared)
+    results.append(result('panels.aggregates_step', time_call(lambda: aggregates.update(batch, batch), repeat),
+                          rows=rows, batch_rows=len(batch)))
+
+    for panel, (read, build, update) in PANELS.items():
+        data = read(aggregates)
+        fig = build(data)
+        results.append(result(f'panels.{panel}.aggregate', time_call(lambda: read(aggregates), repeat), rows=rows))
+        results.append(result(f'panels.{panel}.build', time_call(lambda: build(data), repeat), rows=rows))
+        if update is not None:
+            results.append(result(f'panels.{panel}.update', time_call(lambda: update(fig, data), repeat), rows=rows))
+    return results
+
+
+def main(num_rows):
+    print(f"{'stage':<28} {'rows':>8} {'median (ms)':>12}")
+    for record in run(num_rows):
+        name = record['name'] + (f" ({record['params']['cache']})" if 'cache' in record['params'] else '')
+        print(f"{name:<28} {record['params']['rows']:>8} {record['median_s'] * 1000:>12.2f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else None)
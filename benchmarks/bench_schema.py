@@ -0,0 +1,73 @@
+"""
+Memory and timing report for the categorical log schema.
+
+Compares the log frame with plain string columns against the same frame with
+schema.apply_schema applied, using Funolympics_data.csv scaled up to the
+requested number of rows.
+
+Run from the repository root:
+    python -m benchmarks.bench_schema [num_rows]
+"""
+import sys
+
+from benchmarks.common import load_snapshot, result, time_call
+from schema import apply_schema, sports
+from ua_classifier import classify_user_agents
+
+SELECTED_SPORTS = sports[:5]
+
+# Operation -> filter or aggregation timed on both frames
+OPERATIONS = {
+    'value_counts_sport': lambda df: df['Sport'].value_counts(),
+    'value_counts_country': lambda df: df['Country'].value_counts(),
+    'groupby_country_sport': lambda df: df.groupby(['Country', 'Sport'], observed=True).size(),
+    'isin_sport': lambda df: df[df['Sport'].isin(SELECTED_SPORTS)],
+    'country_equals': lambda df: df[df['Country'] == 'Kenya'],
+}
+
+
+def load_frames(num_rows):
+    """
+    Returns the snapshot scaled to num_rows with plain string columns, and the same frame with the schema applied.
+    """
+    logs_df = load_snapshot(num_rows)
+    devices, browsers = classify_user_agents(logs_df['User_Agent'])
+    plain = logs_df.assign(Device=devices.astype(object), Browser=browsers.astype(object))
+    for name in ['Country', 'Sport', 'User_Agent', 'Device', 'Browser']:
+        plain[name] = plain[name].astype(object)
+    return plain, apply_schema(plain.copy())
+
+
+def run(sizes=(100000,), repeat=5):
+    """
+    Returns benchmark records for applying the schema, with the memory of both frames,
+    and for every operation on the string and the categorical frame.
+    """
+    results = []
+    for num_rows in sizes:
+        plain, categorical = load_frames(num_rows)
+        timing = time_call(lambda: apply_schema(plain.copy()), repeat)
+        results.append(result('schema.apply', dict(timing, plain_bytes=int(plain.memory_usage(deep=True).sum()),
+                                                    schema_bytes=int(categorical.memory_usage(deep=True).sum())), rows=num_rows))
+        for name, operation in OPERATIONS.items():
+            results.append(result(f'schema.{name}', time_call(lambda: operation(plain), repeat), rows=num_rows, columns='strings'))
+            results.append(result(f'schema.{name}', time_call(lambda: operation(categorical), repeat), rows=num_rows, columns='categorical'))
+    return results
+
+
+def main(num_rows):
+    records = run([num_rows])
+    memory = records[0]
+    timings = {(record['name'], record['params']['columns']): record['best_s'] * 1000 for record in records[1:]}
+    print(f"Rows: {num_rows}")
+    print(f"Memory: {memory['plain_bytes'] / 1e6:.1f} MB as strings, {memory['schema_bytes'] / 1e6:.1f} MB with schema "
+          f"({memory['plain_bytes'] / memory['schema_bytes']:.1f}x smaller)")
+    print(f"{'operation':<26} {'strings (ms)':>13} {'schema (ms)':>12} {'speedup':>8}")
+    for name in OPERATIONS:
+        before = timings[f'schema.{name}', 'strings']
+        after = timings[f'schema.{name}', 'categorical']
+        print(f"{name:<26} {before:>13.2f} {after:>12.2f} {before / after:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
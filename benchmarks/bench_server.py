@@ -0,0 +1,74 @@
+"""
+Latency and payload size of the log server's read endpoints.
+
+Requests go through the local Flask app's test client, so the numbers cover
+store reads, frame building, serialization and compression without network
+noise. The store is filled once up front, since GET /logs only reads, and the
+in-process producer is kept idle so it neither competes for the GIL nor moves
+the store position between the timed /stats requests.
+
+Run from the repository root:
+    python -m benchmarks.bench_server [num_logs ...]
+"""
+import sys
+
+from benchmarks.common import result, time_call
+import log_server
+import log_wire
+
+FORMATS = ['json', 'columns', 'ndjson', 'arrow']
+ENCODINGS = ['identity', 'gzip', 'zstd']
+
+
+def _get(client, path, encoding):
+    response = client.get(path, headers={'Accept-Encoding': encoding})
+    body = response.get_data()
+    if response.status_code != 200:
+        raise RuntimeError(f"GET {path} returned {response.status_code}")
+    return response, body
+
+
+def run(sizes, repeat=5):
+    """
+    Returns benchmark records for GET /logs per size, format and encoding, and for GET /stats.
+    """
+    if log_server.producer is not None:
+        # The first request starts the producer; with no rate and no prefill it generates nothing
+        log_server.producer.rate = 0
+        log_server.producer.prefill = 0
+    client = log_server.app.test_client()
+    log_server.ingest_log_columns(log_server.generate_log_columns(max(sizes)))
+    offered = log_wire.supported_formats()
+    encodings = [encoding for encoding in ENCODINGS if encoding == 'identity' or encoding in log_wire.content_encodings()]
+    results = []
+    for num_logs in sizes:
+        for name in FORMATS:
+            if log_wire.FORMAT_NAMES[name] not in offered:
+                continue
+            for encoding in encodings:
+                path = f'/logs?num_logs={num_logs}&format={name}'
+                _, body = _get(client, path, encoding)
+                timing = time_call(lambda: _get(client, path, encoding), repeat)
+                results.append(result('server.logs', dict(timing, bytes=len(body)), rows=num_logs, format=name, encoding=encoding))
+        path = f'/stats?window={num_logs}'
+        # Stats are reused for requests at the same store position, so time a fresh computation as well as a reuse
+        def uncached():
+            log_server.clear_stats_cache()
+            return _get(client, path, 'identity')
+        _, body = uncached()
+        results.append(result('server.stats', dict(time_call(uncached, repeat), bytes=len(body)), rows=num_logs, cached=False))
+        results.append(result('server.stats', dict(time_call(lambda: _get(client, path, 'identity'), repeat), bytes=len(body)), rows=num_logs, cached=True))
+    return results
+
+
+def main(sizes):
+    print(f"{'endpoint':<14} {'rows':>8} {'format':>8} {'encoding':>9} {'median (ms)':>12} {'bytes':>12}")
+    for record in run(sizes):
+        params = record['params']
+        label = params.get('format', 'cached' if params.get('cached') else 'uncached')
+        print(f"{record['name']:<14} {params['rows']:>8} {label:>8} {params.get('encoding', '-'):>9} "
+              f"{record['median_s'] * 1000:>12.2f} {record['bytes']:>12}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000])
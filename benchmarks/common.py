@@ -0,0 +1,41 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+import statistics
+import time
+
+import pandas as pd
+
+SNAPSHOT_CSV = 'Funolympics_data.csv'
+
+
+def time_call(func, repeat=5):
+    """
+    Times func() `repeat` times.
+
+    Returns:
+    dict: best_s, median_s and repeat.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {'best_s': min(timings), 'median_s': statistics.median(timings), 'repeat': repeat}
+
+
+def result(name, timing, **params):
+    """
+    One machine-readable benchmark record.
+    """
+    return dict({'name': name}, params=params, **timing)
+
+
+def load_snapshot(num_rows=None):
+    """
+    Loads Funolympics_data.csv, repeated up to `num_rows` rows when given.
+    """
+    logs_df = pd.read_csv(SNAPSHOT_CSV)
+    if num_rows is not None:
+        logs_df = pd.concat([logs_df] * -(-num_rows // len(logs_df)), ignore_index=True).head(num_rows)
+    return logs_df
@@ -0,0 +1,106 @@
+"""
+Runs the ingest -> aggregate -> render benchmarks and writes the results as JSON.
+
+Covers generator throughput (bench_generate), /logs and /stats latency and
+payload size (bench_server), the per-panel compute of the dashboard loop
+(bench_panels) and the categorical schema's memory and filter speed
+(bench_schema). Each result is a record with a name, its parameters and the
+best/median time in seconds, so runs can be compared to catch regressions.
+
+Run from the repository root:
+    python -m benchmarks.suite --output benchmarks/results/latest.json
+    python -m benchmarks.suite --compare benchmarks/results/baseline.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import bench_generate, bench_panels, bench_schema, bench_server
+
+SIZES = [1000, 10000, 100000]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(sizes=SIZES, repeat=5):
+    """
+    Runs every benchmark.
+
+    Returns:
+    dict: Run metadata and the list of benchmark records.
+    """
+    results = bench_generate.run(sizes, repeat=max(1, repeat // 2))
+    results += bench_server.run(sizes, repeat)
+    results += bench_panels.run(repeat=repeat)
+    results += bench_schema.run(sizes, repeat)
+    return {
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'results': results,
+    }
+
+
+def _key(record):
+    return record['name'], json.dumps(record['params'], sort_keys=True)
+
+
+def compare(baseline, current, threshold=0.2):
+    """
+    Lists benchmarks whose median time grew by more than `threshold` (a fraction) against the baseline.
+
+    Returns:
+    list: (name, params, baseline median, current median) for each regression.
+    """
+    previous = {_key(record): record for record in baseline['results']}
+    regressions = []
+    for record in current['results']:
+        before = previous.get(_key(record))
+        if before is not None and record['median_s'] > before['median_s'] * (1 + threshold):
+            regressions.append((record['name'], record['params'], before['median_s'], record['median_s']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='FunOlympics benchmark suite')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='Row counts for the generator and /logs benchmarks')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='JSON file to write; defaults to benchmarks/results/<timestamp>.json')
+    parser.add_argument('--compare', help='Baseline JSON file to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Slowdown fraction reported as a regression')
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.repeat)
+    output = args.output or os.path.join('benchmarks', 'results', report['created'].replace(':', '') + '.json')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as results_file:
+        json.dump(report, results_file, indent=2)
+    print(f"Wrote {len(report['results'])} results to {output}")
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(json.load(baseline_file), report, args.threshold)
+        for name, params, before, after in regressions:
+            print(f"REGRESSION {name} {params}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Plotly figures for the dashboard panels.
+
+Each panel has a build function, which creates the figure from the panel's
+aggregate, and where possible an update function, which swaps new data into an
+existing figure's traces so the figure does not have to be rebuilt.
+"""
+import plotly.express as px
+
+
+def interests_bar(interest, title):
+    return px.bar(interest, x='Sport', y='Count', title=title, labels={'Sport': 'Sport', 'Count': 'Number of Views'})
+
+
+def update_interests_bar(fig, interest):
+    fig.update_traces(x=interest['Sport'], y=interest['Count'])
+
+
+def geo_map(country_views):
+    fig_geo = px.choropleth(
+        country_views,
+        locations="Country",
+        locationmode='country names',
+        color="Views",
+        hover_name="Country",
+        color_continuous_scale=px.colors.sequential.Viridis,
+        title="Geographic Distribution of Views"
+    )
+    fig_geo.update_layout(
+        geo=dict(
+            showframe=False,
+            showcoastlines=False,
+            projection_type='equirectangular'
+        ),
+        title=dict(
+            x=0.5,
+            xanchor='center'
+        )
+    )
+    return fig_geo
+
+
+def update_geo_map(fig_geo, country_views):
+    fig_geo.update_traces(locations=country_views['Country'], z=country_views['Views'], hovertext=country_views['Country'])
+
+
+def device_pie(device_distribution):
+    fig_device = px.pie(device_distribution, values=device_distribution.values, names=device_distribution.index, hole=0.5,
+                        title='Distribution of Traffic by Device Type', color_discrete_sequence=px.colors.qualitative.Set3)
+    fig_device.update_traces(textinfo='percent+label', pull=[0.1]*len(device_distribution), textposition='inside')
+    fig_device.update_layout(showlegend=False)
+    return fig_device
+
+
+def status_pie(status_code_distribution):
+    fig_status = px.pie(status_code_distribution, values=status_code_distribution.values, names=status_code_distribution.index, hole=0.5,
+                        title='Distribution of Traffic by Status Code', color_discrete_sequence=px.colors.qualitative.Pastel1)
+    fig_status.update_traces(textinfo='percent')
+    fig_status.update_layout(legend=dict(orientation="v", yanchor="top", y=1, xanchor="left", x=1.1))
+    return fig_status
+
+
+def browser_pie(browser_distribution):
+    fig_browser = px.pie(browser_distribution, values=browser_distribution.values, names=browser_distribution.index,
+                         title='Distribution of Browsers', hole=0.5, color_discrete_sequence=px.colors.qualitative.Set2)
+    fig_browser.update_traces(textinfo='percent', pull=[0.1]*len(browser_distribution), textposition='inside')
+    fig_browser.update_layout(showlegend=True)
+    return fig_browser
+
+
+def update_pie(fig, distribution):
+    trace = fig.data[0]
+    trace.update(values=distribution.values, labels=distribution.index)
+    if trace.pull is not None:
+        trace.pull = [0.1]*len(distribution)
+
+
+def trend_line(time_data, x):
+    return px.line(time_data, x=x, y='Views', title='Trend of Views Over Time', labels={x: x, 'Views': 'Number of Views'})
+
+
+def update_trend_line(fig, time_data, x):
+    fig.update_traces(x=time_data[x], y=time_data['Views'])
+
+
+def sports_trend_lines(sports_trends):
+    # One trace per sport, so this figure is rebuilt rather than updated when it changes
+    return px.line(sports_trends, x='Date', y='Views', color='Sport', title='Sports Popularity Over Time', labels={'Date': 'Date', 'Views': 'Number of Views'})
+
+
+def heatmap(heatmap_data):
+    fig = px.imshow(heatmap_data, aspect="auto", title='Peak Viewership Hours', labels={'x': 'Day of Week', 'y': 'Hour of Day', 'color': 'Number of Views'})
+    fig.update_layout(xaxis_title='Day of Week', yaxis_title='Hour of Day')
+    return fig
+
+
+def update_heatmap(fig, heatmap_data):
+    fig.update_traces(z=heatmap_data.values, x=list(heatmap_data.columns), y=list(heatmap_data.index))
+
+
+def history_line(history_data):
+    return px.line(history_data, x='Date', y='Views', title='Archived Views per Day', labels={'Date': 'Date', 'Views': 'Number of Views'})
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from schema import apply_schema
+from ua_classifier import classify_user_agents
+
+# Format of the string timestamps sent by servers that predate epoch timestamps
+TIMESTAMP_FORMAT = '%d/%m/%Y:%H:%M:%S'
+
+
+def parse_timestamps(timestamps):
+    """
+    Converts a Timestamp column to datetime64.
+
+    Integer columns are read as epoch seconds, string columns with TIMESTAMP_FORMAT,
+    and columns that are already datetimes are returned unchanged.
+    """
+    if pd.api.types.is_datetime64_any_dtype(timestamps):
+        return timestamps
+    if pd.api.types.is_integer_dtype(timestamps):
+        return pd.Series(np.asarray(timestamps, dtype=np.int64).astype('datetime64[s]'), index=timestamps.index, name=timestamps.name)
+    return pd.to_datetime(timestamps, format=TIMESTAMP_FORMAT).astype('datetime64[s]')
+
+
+def format_timestamps(timestamps):
+    """
+    Formats a Timestamp column (epoch seconds, strings or datetimes) with TIMESTAMP_FORMAT,
+    for exports that have to match Funolympics_data.csv.
+    """
+    return parse_timestamps(timestamps).dt.strftime(TIMESTAMP_FORMAT)
+
+
+def time_buckets(timestamps):
+    """
+    Derives the time buckets used by the dashboard with integer arithmetic on epoch seconds.
+
+    Returns:
+    dict: Date (day), Month (first day of the month), Hour (0-23) and DayOfWeek (0 is Monday).
+    """
+    seconds = timestamps.to_numpy(dtype='datetime64[s]').astype(np.int64)
+    days = seconds // 86400
+    dates = days.astype('datetime64[D]')
+    return {
+        'Date': dates.astype('datetime64[s]'),
+        'Month': dates.astype('datetime64[M]').astype('datetime64[s]'),
+        'Hour': (seconds // 3600 % 24).astype(np.int8),
+        'DayOfWeek': ((days + 3) % 7).astype(np.int8),  # 1970-01-01 was a Thursday
+    }
+
+
+def prepare_logs(logs_df):
+    """
+    Ingest stage for freshly fetched rows: applies the categorical schema, parses timestamps
+    once, adds the time buckets and classifies user agents, so nothing downstream has to
+    touch strings again.
+
+    Parameters:
+    logs_df (pd.DataFrame): Logs as decoded from the server.
+
+    Returns:
+    pd.DataFrame: A copy with categorical columns, a datetime64 Timestamp and Date, Month, Hour,
+    DayOfWeek, Device and Browser columns.
+    """
+    if logs_df.empty:
+        return logs_df
+    logs_df = apply_schema(logs_df.copy())
+    logs_df['Timestamp'] = parse_timestamps(logs_df['Timestamp'])
+    for name, values in time_buckets(logs_df['Timestamp']).items():
+        logs_df[name] = values
+    logs_df['Device'], logs_df['Browser'] = classify_user_agents(logs_df['User_Agent'])
+    return logs_df
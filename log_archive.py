@@ -0,0 +1,236 @@
+"""
+Persistent on-disk archive of generated logs.
+
+Batches are buffered in memory and flushed as Parquet files into a Hive-style
+layout partitioned by the log's date (root/date=2023-05-14/part-....parquet).
+Reads go through pyarrow.dataset with partition pruning, Parquet predicate
+pushdown and memory-mapped files, so a time range only touches the partitions
+and columns it needs.
+
+Generated logs spread over the whole year, so every flush adds a small file to
+each day it touches, and scans slow down as files pile up. Once a day holds
+`compact_files` files smaller than `flush_rows` rows, a later flush merges
+them into one; each flush merges at most COMPACT_DAYS_PER_FLUSH days, so the
+work is spread over flushes instead of stalling the writer for seconds.
+Merged rows are rewritten, repeatedly while a day's file stays under
+`flush_rows` rows. Partitioning by month instead would avoid compaction but
+lose per-day pruning and the metadata-only daily counts.
+
+Files are written under names starting with '.', which dataset discovery
+skips, and renamed into place when complete. Readers in the writing process
+hold the archive lock. A reader in another process can still list a day just
+before it is compacted: it retries when a listed file has gone, and between
+the rename of the merged file and the removal of the small ones it can briefly
+see that day's rows twice.
+"""
+import os
+import threading
+import time
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.fs
+import pyarrow.parquet as pq
+
+from schema import apply_schema
+
+PARTITIONING = ds.partitioning(pa.schema([('date', pa.string())]), flavor='hive')
+
+# Days merged by one flush at most
+COMPACT_DAYS_PER_FLUSH = 32
+
+# Attempts of a read whose listed files were removed by compaction in the meantime, and the first
+# wait between attempts in seconds (doubled after each)
+READ_ATTEMPTS = 5
+READ_RETRY_DELAY = 0.05
+
+
+def _date_string(value):
+    return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+
+class LogArchive:
+    """
+    Parameters:
+    root (str): Directory holding the archive; created if missing.
+    flush_rows (int): Buffered rows that trigger a flush to disk.
+    compact_files (int): Small files a day may hold before they are merged into one.
+    """
+
+    def __init__(self, root, flush_rows=100_000, compact_files=16):
+        self.root = os.path.abspath(root)
+        self.flush_rows = int(flush_rows)
+        self.compact_files = int(compact_files)
+        self._filesystem = pyarrow.fs.LocalFileSystem(use_mmap=True)
+        self._pending = []
+        self._pending_rows = 0
+        self._file_rows = {}  # Row count per archive file, so compaction checks need not read metadata
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def write(self, logs_df):
+        """
+        Buffers a batch of logs; Timestamp must be int64 epoch seconds or datetime64.
+        """
+        if logs_df.empty:
+            return
+        with self._lock:
+            self._pending.append(logs_df)
+            self._pending_rows += len(logs_df)
+            if self._pending_rows >= self.flush_rows:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        logs_df = pd.concat(self._pending, ignore_index=True)
+        self._pending, self._pending_rows = [], 0
+        table = pa.Table.from_pandas(logs_df, preserve_index=False)
+        timestamps = table['Timestamp']
+        if not pa.types.is_timestamp(timestamps.type):
+            timestamps = pc.cast(timestamps, pa.int64()).cast(pa.timestamp('s'))
+            table = table.set_column(table.schema.get_field_index('Timestamp'), 'Timestamp', timestamps)
+        table = table.append_column('date', pc.strftime(timestamps, format='%Y-%m-%d'))
+        written = []
+        ds.write_dataset(
+            table, self.root, format='parquet', partitioning=PARTITIONING, filesystem=self._filesystem,
+            basename_template=f'.part-{uuid.uuid4().hex}-{{i}}.parquet', existing_data_behavior='overwrite_or_ignore',
+            file_visitor=lambda file: written.append((file.path, file.metadata.num_rows)),
+        )
+        for path, rows in written:
+            directory, name = os.path.split(path)
+            os.replace(path, os.path.join(directory, name[1:]))
+            self._file_rows[os.path.join(directory, name[1:])] = rows
+        self._compact_locked(self.compact_files, COMPACT_DAYS_PER_FLUSH)
+
+    def compact(self, min_files=2):
+        """
+        Merges the small files of every day holding at least `min_files` of them; returns the number of days merged.
+        """
+        with self._lock:
+            return self._compact_locked(min_files)
+
+    def _file_row_count(self, path):
+        rows = self._file_rows.get(path)
+        if rows is None:
+            rows = self._file_rows[path] = pq.read_metadata(path).num_rows
+        return rows
+
+    def _compact_locked(self, min_files, max_days=None):
+        min_files = max(min_files, 2)
+        candidates = []
+        for entry in os.scandir(self.root):
+            if not entry.is_dir() or not entry.name.startswith('date='):
+                continue
+            paths = [os.path.join(entry.path, name) for name in sorted(os.listdir(entry.path))
+                     if name.endswith('.parquet') and not name.startswith('.')]
+            if len(paths) < min_files:
+                continue
+            small = [path for path in paths if self._file_row_count(path) < self.flush_rows]
+            if len(small) >= min_files:
+                candidates.append((entry.path, small))
+        # The days with the most small files first
+        candidates.sort(key=lambda candidate: len(candidate[1]), reverse=True)
+        for directory, small in candidates[:max_days]:
+            tables = []
+            for path in small:
+                with pq.ParquetFile(path) as parquet_file:
+                    tables.append(parquet_file.read())
+            table = pa.concat_tables(tables, promote_options='default')
+            name = f'part-{uuid.uuid4().hex}-0.parquet'
+            pq.write_table(table, os.path.join(directory, '.' + name))
+            os.replace(os.path.join(directory, '.' + name), os.path.join(directory, name))
+            self._file_rows[os.path.join(directory, name)] = table.num_rows
+            for path in small:
+                os.remove(path)
+                self._file_rows.pop(path, None)
+        return len(candidates[:max_days])
+
+    def _dataset(self):
+        return ds.dataset(self.root, format='parquet', partitioning=PARTITIONING, filesystem=self._filesystem)
+
+    def _filter(self, start, end):
+        """
+        Builds a filter for start <= Timestamp < end; either bound may be None.
+        """
+        expression = None
+        if start is not None:
+            start = pd.Timestamp(start)
+            expression = (ds.field('date') >= _date_string(start)) & (ds.field('Timestamp') >= pa.scalar(start.to_pydatetime(), pa.timestamp('s')))
+        if end is not None:
+            end = pd.Timestamp(end)
+            bound = (ds.field('date') <= _date_string(end)) & (ds.field('Timestamp') < pa.scalar(end.to_pydatetime(), pa.timestamp('s')))
+            expression = bound if expression is None else expression & bound
+        return expression
+
+    def read(self, start=None, end=None, columns=None):
+        """
+        Reads archived logs with start <= Timestamp < end.
+
+        Parameters:
+        start, end (datetime-like): Time range; either bound may be omitted.
+        columns (list): Columns to load; all log columns if omitted.
+
+        Returns:
+        pd.DataFrame: The matching logs with the categorical schema applied.
+        """
+        return self._read_retrying(self._read, start, end, columns)
+
+    def _read_retrying(self, read, *args):
+        with self._lock:
+            for attempt in range(READ_ATTEMPTS):
+                try:
+                    return read(*args)
+                except (FileNotFoundError, pa.ArrowInvalid):
+                    # Another process compacted a day after it was listed; list the files again
+                    if attempt == READ_ATTEMPTS - 1:
+                        raise
+                    time.sleep(READ_RETRY_DELAY * 2 ** attempt)
+
+    def _read(self, start, end, columns):
+        if not os.listdir(self.root):
+            return pd.DataFrame(columns=columns)
+        dataset = self._dataset()
+        if columns is None:
+            columns = [name for name in dataset.schema.names if name != 'date']
+        table = dataset.to_table(columns=columns, filter=self._filter(start, end))
+        return apply_schema(table.to_pandas())
+
+    def daily_counts(self, start=None, end=None):
+        """
+        Counts archived logs per day from Parquet metadata, without reading any column data.
+
+        Parameters:
+        start, end (date-like): Inclusive range of days; either bound may be omitted.
+
+        Returns:
+        pd.DataFrame: Date and Views columns, one row per archived day.
+        """
+        return self._read_retrying(self._daily_counts, start, end)
+
+    def _daily_counts(self, start, end):
+        counts = {}
+        if os.listdir(self.root):
+            expression = None
+            if start is not None:
+                expression = ds.field('date') >= _date_string(start)
+            if end is not None:
+                bound = ds.field('date') <= _date_string(end)
+                expression = bound if expression is None else expression & bound
+            for fragment in self._dataset().get_fragments(filter=expression):
+                date = ds.get_partition_keys(fragment.partition_expression)['date']
+                counts[date] = counts.get(date, 0) + fragment.count_rows()
+        dates = sorted(counts)
+        return pd.DataFrame({'Date': pd.to_datetime(dates, format='%Y-%m-%d'), 'Views': [counts[date] for date in dates]})
+
+    def stats(self):
+        with self._lock:
+            pending_rows = self._pending_rows
+        return {'root': self.root, 'pending_rows': pending_rows, 'flush_rows': self.flush_rows, 'compact_files': self.compact_files}
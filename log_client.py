@@ -0,0 +1,172 @@
+"""
+HTTP client for the log server used by the dashboard.
+
+Requests share one pooled keep-alive session, ask for compressed and compact
+responses, time out instead of hanging the script, and retry transient failures
+with exponential backoff. The server defaults to the hosted instance and can be
+pointed at a local log_server.py through FUNOLYMPICS_LOG_SERVER, e.g.
+FUNOLYMPICS_LOG_SERVER=http://127.0.0.1:5000.
+"""
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+import log_wire
+
+LOG_SERVER_URL = os.environ.get('FUNOLYMPICS_LOG_SERVER', 'https://bida20.pythonanywhere.com')
+
+# (connect, read) timeouts in seconds
+DEFAULT_TIMEOUT = (3.05, 15)
+
+
+class LogClient:
+    """
+    Pooled, retrying client for the log server's /logs, /stats and /archive endpoints.
+
+    Parameters:
+    base_url (str): Root URL of the log server.
+    timeout (float or tuple): Requests timeout, in seconds.
+    retries (int): How many times a failed request is retried.
+    backoff_factor (float): Base delay for the exponential backoff between retries.
+    pool_size (int): Connections kept alive per host.
+    """
+
+    def __init__(self, base_url=LOG_SERVER_URL, timeout=DEFAULT_TIMEOUT, retries=3, backoff_factor=0.5, pool_size=4):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        retry = Retry(total=retries, backoff_factor=backoff_factor,
+                      status_forcelist=(429, 500, 502, 503, 504), allowed_methods=['GET'])
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # urllib3 only advertises the encodings (zstd, br) whose decoders are installed
+        self.session.headers.update({'Accept': log_wire.accept_header(), 'Accept-Encoding': ACCEPT_ENCODING})
+        # One worker per pooled connection; prefetch delays run on timers, so workers only ever fetch
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='log-prefetch')
+        self._timers = {}
+        self._timers_lock = threading.Lock()
+
+    def fetch_log_delta(self, since=None, num_logs=10000, limit=10000):
+        """
+        Fetches logs, optionally only those after a sequence cursor.
+
+        Parameters:
+        since (int): Sequence number returned by the previous call, or None for the latest rows.
+        num_logs (int): How many of the newest logs to return without a cursor (the hosted server also generates this many per call).
+        limit (int): The most rows to return when fetching by cursor.
+
+        Returns:
+        tuple: (pd.DataFrame of logs, next sequence cursor or None if the server does not report one)
+
+        Raises:
+        requests.RequestException: If the server cannot be reached or keeps failing.
+        """
+        params = {'num_logs': num_logs}
+        if since is not None:
+            params['since'] = since
+            params['limit'] = limit
+        response = self.session.get(f"{self.base_url}/logs", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        df = log_wire.decode_frame(response.content, response.headers.get('Content-Type'))
+        next_seq = response.headers.get('X-Log-Next-Seq')
+        return df, int(next_seq) if next_seq is not None else None
+
+    def fetch_logs(self, num_logs=10000):
+        return self.fetch_log_delta(num_logs=num_logs)[0]
+
+    def fetch_archived_logs(self, start=None, end=None, columns=None):
+        """
+        Fetches archived logs with start <= Timestamp < end from the server's Parquet archive.
+        """
+        params = {'start': start, 'end': end, 'columns': ','.join(columns) if columns else None}
+        response = self.session.get(f"{self.base_url}/archive/logs", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return log_wire.decode_frame(response.content, response.headers.get('Content-Type'))
+
+    def fetch_daily_history(self, start=None, end=None):
+        """
+        Fetches archived views per day for the inclusive date range start..end.
+
+        Returns:
+        pd.DataFrame: Date and Views columns.
+        """
+        response = self.session.get(f"{self.base_url}/archive/daily", params={'start': start, 'end': end},
+                                    headers={'Accept': log_wire.JSON}, timeout=self.timeout)
+        response.raise_for_status()
+        daily_views = pd.DataFrame(response.json())
+        daily_views['Date'] = pd.to_datetime(daily_views['Date'], format='%Y-%m-%d')
+        return daily_views
+
+    def fetch_stats(self, window=10000, country=None, sports=None):
+        """
+        Fetches panel aggregates over the newest `window` rows from the server's /stats endpoint.
+
+        Returns:
+        dict: The decoded stats, one entry per panel.
+        """
+        params = {'window': window, 'country': country, 'sports': ','.join(sports) if sports else None}
+        response = self.session.get(f"{self.base_url}/stats", params=params, headers={'Accept': log_wire.JSON}, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def supports_stats(self):
+        """
+        Checks whether the server has the /stats endpoint (older servers only serve /logs).
+        Raises requests.RequestException when the server cannot be reached, so callers
+        can tell an unreachable server from one without /stats.
+        """
+        response = self.session.get(f"{self.base_url}/stats/summary", params={'window': 0}, timeout=self.timeout)
+        return response.status_code == 200
+
+    def prefetch_log_delta(self, since=None, num_logs=10000, limit=10000, delay=0):
+        """
+        Starts fetch_log_delta on a background thread, after waiting `delay` seconds,
+        so the next window downloads while the current one renders. The wait runs on a
+        timer and the fetch is only handed to the thread pool once it is due, so sessions
+        sharing the client never queue behind each other's delays.
+
+        Returns:
+        concurrent.futures.Future: Resolves to the fetch_log_delta result.
+        """
+        if delay <= 0:
+            return self._executor.submit(self.fetch_log_delta, since, num_logs, limit)
+        future = Future()
+        timer = threading.Timer(delay, self._submit_when_due, (future, since, num_logs, limit))
+        timer.daemon = True
+        with self._timers_lock:
+            self._timers[future] = timer
+        timer.start()
+        return future
+
+    def _submit_when_due(self, future, since, num_logs, limit):
+        with self._timers_lock:
+            self._timers.pop(future, None)
+        try:
+            self._executor.submit(self._fetch_into, future, since, num_logs, limit)
+        except RuntimeError:
+            # The client was closed while the timer was pending
+            future.cancel()
+
+    def _fetch_into(self, future, since, num_logs, limit):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(self.fetch_log_delta(since, num_logs, limit))
+        except Exception as error:
+            future.set_exception(error)
+
+    def close(self):
+        with self._timers_lock:
+            timers, self._timers = self._timers, {}
+        for future, timer in timers.items():
+            timer.cancel()
+            future.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
@@ -0,0 +1,183 @@
+"""
+Background log producer.
+
+Logs are generated at a configurable rate, independent of how often clients
+poll, and written to the log store; GET /logs only reads. Burst profiles
+raise the rate periodically to simulate event peaks, which also makes the
+producer usable as a load generator for capacity testing.
+
+The Flask dev server (python log_server.py) runs the producer as a thread.
+In production mode (python log_server.py --workers N) it runs as a separate
+process and is the single writer of the shared-memory store. It can also be
+run on its own next to a gunicorn deployment:
+
+    python log_producer.py --store-path /dev/shm/funolympics-logs --create --rate 2000 --profile final
+    LOG_STORE_PATH=/dev/shm/funolympics-logs gunicorn -w 4 log_server:app
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+
+import numpy as np
+
+from metrics import span
+
+# Rate multipliers over one burst period, as (start, end, multiplier) with start/end as fractions of the period
+BURST_PROFILES = {
+    'steady': [],
+    # A medal final: traffic climbs to 5x the base rate for the first tenth of every period
+    'final': [(0.0, 0.05, 3.0), (0.05, 0.1, 5.0)],
+    # Opening ceremony: a short 10x spike, then a smaller second wave halfway through
+    'opening': [(0.0, 0.02, 10.0), (0.02, 0.1, 4.0), (0.5, 0.6, 2.0)],
+}
+
+
+# Rate multiplier of a burst profile at a point in time
+def burst_multiplier(profile, elapsed, period):
+    """
+    Parameters:
+    profile (str): A key of BURST_PROFILES.
+    elapsed (float): Seconds since the producer started.
+    period (float): Length of one burst cycle, in seconds.
+
+    Returns:
+    float: The factor the base rate is multiplied by, 1.0 outside bursts.
+    """
+    phase = (elapsed % period) / period
+    for start, end, multiplier in BURST_PROFILES[profile]:
+        if start <= phase < end:
+            return multiplier
+    return 1.0
+
+
+class LogProducer:
+    """
+    Generates logs on a background thread (or the calling thread with run()).
+
+    Parameters:
+    generate (callable): generate(num_logs, rng) -> dict of log columns.
+    ingest (callable): ingest(columns) stores a generated batch.
+    rate (float): Base rate, in logs per second.
+    profile (str): Burst profile, a key of BURST_PROFILES.
+    period (float): Length of one burst cycle, in seconds.
+    tick (float): Seconds between generated batches.
+    prefill (int): Logs generated once at start, so the store is not empty for the first clients.
+    seed (int): Optional seed for reproducible load.
+    """
+
+    def __init__(self, generate, ingest, rate=500, profile='steady', period=600, tick=0.25, prefill=10000, seed=None):
+        if profile not in BURST_PROFILES:
+            raise ValueError(f"Unknown burst profile: {profile}; expected one of {sorted(BURST_PROFILES)}")
+        self.generate = generate
+        self.ingest = ingest
+        self.rate = float(rate)
+        self.profile = profile
+        self.period = float(period)
+        self.tick = float(tick)
+        self.prefill = int(prefill)
+        self.rng = np.random.default_rng(seed)
+        self.produced = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def batch_size(self, elapsed, seconds):
+        """
+        Draws how many logs arrive in `seconds` at time `elapsed`; arrivals are Poisson around the current rate.
+        """
+        return int(self.rng.poisson(self.rate * burst_multiplier(self.profile, elapsed, self.period) * seconds))
+
+    def _produce(self, num_logs):
+        if num_logs > 0:
+            with span('producer.generate'):
+                columns = self.generate(num_logs, self.rng)
+            self.ingest(columns)
+            self.produced += num_logs
+
+    def run(self):
+        """
+        Generates logs until stop() is called.
+        """
+        self._produce(self.prefill)
+        started = last = time.monotonic()
+        while not self._stop.wait(max(0.0, self.tick - (time.monotonic() - last))):
+            now = time.monotonic()
+            self._produce(self.batch_size(now - started, now - last))
+            last = now
+
+    def start(self):
+        """
+        Starts run() on a daemon thread and returns the producer.
+        """
+        with self._start_lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self.run, name='log-producer', daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self):
+        return {'rate': self.rate, 'profile': self.profile, 'period': self.period, 'produced': self.produced,
+                'running': self._thread is not None and self._thread.is_alive()}
+
+
+# Generate logs into a shared store until the process is stopped
+def run_process(store_path, rate=500, profile='steady', period=600):
+    """
+    Entry point of the producer process in production mode.
+
+    Parameters:
+    store_path (str): An existing log store segment.
+    rate, profile, period: As for LogProducer.
+    """
+    from log_server import LOG_ARCHIVE_DIR, LOG_ARCHIVE_FLUSH_ROWS, generate_log_columns, log_columns_to_frame, log_dtypes
+    from log_store import SharedRingBuffer
+
+    store = SharedRingBuffer(store_path, log_dtypes, writable=True)
+    archive = None
+    if LOG_ARCHIVE_DIR:
+        from log_archive import LogArchive
+        archive = LogArchive(LOG_ARCHIVE_DIR, flush_rows=LOG_ARCHIVE_FLUSH_ROWS)
+
+    def ingest(columns):
+        store.append(columns)
+        if archive is not None:
+            archive.write(log_columns_to_frame(columns, epoch_timestamps=True))
+
+    # Exit cleanly on terminate() so buffered archive rows are flushed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        LogProducer(generate_log_columns, ingest, rate, profile, period).run()
+    finally:
+        if archive is not None:
+            archive.flush()
+
+# Start the producer in a child process
+def start_process(store_path, rate=500, profile='steady', period=600):
+    producer = multiprocessing.Process(target=run_process, args=(store_path, rate, profile, period), name='log-producer', daemon=True)
+    producer.start()
+    return producer
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate FunOlympics logs into a shared log store')
+    parser.add_argument('--store-path', default=os.environ.get('LOG_STORE_PATH', '/dev/shm/funolympics-logs'))
+    parser.add_argument('--create', action='store_true', help='Create (or reset) the store segment first')
+    parser.add_argument('--rate', type=float, default=500, help='Base rate in logs per second')
+    parser.add_argument('--profile', choices=sorted(BURST_PROFILES), default='steady')
+    parser.add_argument('--period', type=float, default=600, help='Length of one burst cycle in seconds')
+    args = parser.parse_args()
+    if args.create:
+        from log_server import LOG_STORE_CAPACITY, log_dtypes
+        from log_store import SharedRingBuffer
+        SharedRingBuffer(args.store_path, log_dtypes, capacity=LOG_STORE_CAPACITY, create=True)
+    run_process(args.store_path, args.rate, args.profile, args.period)
@@ -1,8 +1,21 @@
 from faker import Faker
+import atexit
+import os
 import random
 import datetime
-from flask import Flask, request, jsonify
+import threading
+import time
+from collections import OrderedDict
+from flask import Flask, Response, g, request, jsonify
+import numpy as np
 import pandas as pd
+from log_store import ColumnarRingBuffer, SharedRingBuffer
+import log_wire
+from log_producer import LogProducer
+from log_stats import DEFAULT_PANELS, PANELS, compute_log_stats
+from metrics import REGISTRY, SIZE_BUCKETS, span
+from schema import (COUNTRY_DTYPE, SPORT_DTYPE, STATUS_CODE_DTYPE, USER_AGENT_DTYPE, from_codes,
+                    olympic_countries, sample_user_agents, sports, status_codes)
 
 # Initialize Faker
 fake = Faker()
@@ -11,23 +24,6 @@ fake = Faker()
 def generate_ip():
     return '.'.join(str(random.randint(0, 255)) for _ in range(4))
 
-# List of countries participating in the FunOlympics
-olympic_countries = [
-    "Algeria", "Angola", "Argentina", "Australia", "Bahrain", "Bangladesh",
-    "Barbados", "Belarus", "Belgium", "Benin", "Bolivia", "Botswana", "Brazil", "Bulgaria",
-    "Burkina Faso", "Burundi", "Cameroon", "Canada", "China", "Colombia", "Comoros",
-    "Czech Republic", "North Korea", "Democratic Republic of the Congo", "Denmark",
-    "Egypt", "Eswatini", "Ethiopia", "Finland", "France", "Gabon", "Germany", "Ghana",
-    "Greece", "Guinea", "Honduras", "Hungary", "India", "Iran", "Iraq",
-    "Ireland", "Israel", "Italy", "Ivory Coast", "Jamaica", "Japan", "Kenya", "Lesotho", "Liberia",
-    "Madagascar", "Malawi", "Mali", "Mauritius", "Mexico", "Morocco", "Mozambique", "Namibia", "Netherlands",
-    "New Zealand", "Nigeria", "Norway", "Pakistan", "Palestine", "Paraguay", "Philippines", "Poland", "Portugal",
-    "Russia", "Rwanda", "Saudi Arabia", "Senegal", "Serbia", "Seychelles", "Sierra Leone", "Singapore", "Slovakia",
-    "Slovenia", "Somalia", "South Africa", "South Korea", "South Sudan", "Spain", "Sri Lanka", "Sudan", "Sweden", "Switzerland", "Syria",
-    "Tanzania", "Thailand", "Trinidad and Tobago", "Tunisia", "Turkey",
-    "Uganda", "Ukraine", "United Kingdom", "United States", "Uruguay", "Venezuela", "Zambia", "Zimbabwe"
-]
-
 # Generate random country
 def generate_country():
     return random.choice(olympic_countries)
@@ -45,59 +41,13 @@ def generate_timestamp():
 
 # Generate random URL based on various sports-pages and endpoints
 def generate_url():
-    sports = [
-        "Archery",
-        "Athletics (Track and Field)",
-        "Badminton",
-        "Basketball",
-        "Boxing",
-        "Canoeing",
-        "Cycling",
-        "Fencing",
-        "Football",
-        "Golf",
-        "Gymnastics",
-        "Handball",
-        "Hockey",
-        "Judo",
-        "Rowing",
-        "Rugby",
-        "Sailing",
-        "Shooting",
-        "Skateboarding",
-        "Sport Climbing",
-        "Surfing",
-        "Table Tennis",
-        "Taekwondo",
-        "Tennis",
-        "Triathlon",
-        "Volleyball",
-        "Weightlifting",
-        "Wrestling"
-    ]
-
     return f"GET/HTTP/1.1/{random.choice(sports)}"
 
 # Generate random HTTP status code
+status_weights = [0.8, 0.15, 0.05]  # Higher chance of successful requests (200)
+
 def generate_status_code():
-    status_codes = [200, 404, 500]
-    weights = [0.8, 0.15, 0.05]  # Higher chance of successful requests (200)
-    return random.choices(status_codes, weights=weights)[0]
-
-# Sample user agents provided
-sample_user_agents = [
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:84.0) Gecko/20100101 Firefox/84.0",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/87.0.4280.88 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Safari/605.1.15",
-    "Mozilla/5.0 (iPhone; CPU iPhone OS 14_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0.3 Mobile/15E148 Safari/604.1",
-    "Mozilla/5.0 (iPad; CPU OS 14_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0.3 Mobile/15E148 Safari/604.1",
-    "Mozilla/5.0 (Linux; Android 10; HD1913) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/87.0.4280.101 Mobile Safari/537.36",
-    "Mozilla/5.0 (Linux; Android 10; LM-Q720) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/87.0.4280.146 Mobile Safari/537.36",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/87.0.4280.88 Safari/537.36 OPR/73.0.3812.123",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/87.0.4280.146 Safari/537.36 Edg/87.0.664.75",
-    "Mozilla/5.0 (iPhone; CPU iPhone OS 14_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) FxiOS/1.14 Mobile/15E148 Safari/605.1.15",
-    "Mozilla/5.0 (iPad; CPU OS 14_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) FxiOS/1.14 Mobile/15E148 Safari/605.1.15"
-]
+    return random.choices(status_codes, weights=status_weights)[0]
 
 # Generate random user agent
 def generate_user_agent():
@@ -141,30 +91,400 @@ def generate_sample_logs(num_logs):
         logs.append(generate_log_entry())
     return logs
 
+# Column order shared by the per-row and batch generators
+log_columns = ['IP', 'Country', 'Timestamp', 'Sport', 'Status_Code', 'Bytes_Transferred', 'User_Agent', 'Time_Elapsed']
+
+# Timestamp range used by generate_timestamp, as epoch seconds
+timestamp_start = int(datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc).timestamp())
+timestamp_days = (datetime.datetime(2023, 12, 31) - datetime.datetime(2023, 1, 1)).days
+
+# Lookup tables used to format numeric columns without per-row Python calls
+_octet_strings = np.array([str(i) for i in range(256)], dtype=object)
+_padded_strings = np.array([f'{i:02d}' for i in range(100)], dtype=object)
+
+# Generate the raw columns of a log batch with NumPy
+def generate_log_columns(num_logs, rng=None):
+    """
+    Generates log columns in one vectorized pass, with the same distributions as generate_log_entry.
+
+    Parameters:
+    num_logs (int): The number of log rows to generate.
+    rng (np.random.Generator): Random generator to draw from; a fresh one is used if omitted.
+
+    Returns:
+    dict: Column name to NumPy array. IP is a uint32, Timestamp is int64 epoch seconds, and
+    Country, Sport, Status_Code and User_Agent are integer codes into the schema's categories.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    days = rng.integers(0, timestamp_days + 1, size=num_logs, dtype=np.int64)
+    seconds = rng.integers(0, 24*60*60 + 1, size=num_logs, dtype=np.int64)
+    return {
+        'IP': rng.integers(0, 2**32, size=num_logs, dtype=np.uint32),
+        'Country': rng.integers(0, len(olympic_countries), size=num_logs, dtype=np.int16),
+        'Timestamp': timestamp_start + days * 86400 + seconds,
+        'Sport': rng.integers(0, len(sports), size=num_logs, dtype=np.int16),
+        'Status_Code': rng.choice(len(status_codes), size=num_logs, p=status_weights).astype(np.int16),
+        'Bytes_Transferred': rng.integers(100, 10000 + 1, size=num_logs, dtype=np.int32),
+        'User_Agent': rng.integers(0, len(sample_user_agents), size=num_logs, dtype=np.int16),
+        'Time_Elapsed': rng.integers(1, 1000 + 1, size=num_logs, dtype=np.int32),
+    }
+
+# Format uint32 IP addresses as dotted quads
+def format_ips(ips):
+    ips = np.asarray(ips, dtype=np.uint32)
+    octets = [_octet_strings[(ips >> shift) & 0xFF] for shift in (24, 16, 8, 0)]
+    return octets[0] + '.' + octets[1] + '.' + octets[2] + '.' + octets[3]
+
+# Format epoch seconds the same way generate_timestamp does ('%d/%m/%Y:%H:%M:%S')
+def format_timestamps(epochs):
+    epochs = np.asarray(epochs, dtype=np.int64)
+    moments = epochs.astype('datetime64[s]')
+    days = moments.astype('datetime64[D]')
+    months = moments.astype('datetime64[M]')
+    years = moments.astype('datetime64[Y]')
+    day = (days - months).astype(np.int64) + 1
+    month = (months - years).astype(np.int64) + 1
+    year = years.astype(np.int64) + 1970
+    second_of_day = (moments - days).astype(np.int64)
+    return (_padded_strings[day] + '/' + _padded_strings[month] + '/' + year.astype(str).astype(object) + ':'
+            + _padded_strings[second_of_day // 3600] + ':' + _padded_strings[second_of_day // 60 % 60] + ':'
+            + _padded_strings[second_of_day % 60])
+
+# Turn raw log columns into the DataFrame layout produced by generate_sample_logs,
+# optionally keeping Timestamp as int64 epoch seconds instead of formatted strings
+def log_columns_to_frame(columns, epoch_timestamps=False):
+    return pd.DataFrame({
+        'IP': format_ips(columns['IP']),
+        'Country': from_codes(columns['Country'], COUNTRY_DTYPE),
+        'Timestamp': columns['Timestamp'] if epoch_timestamps else format_timestamps(columns['Timestamp']),
+        'Sport': from_codes(columns['Sport'], SPORT_DTYPE),
+        'Status_Code': from_codes(columns['Status_Code'], STATUS_CODE_DTYPE),
+        'Bytes_Transferred': columns['Bytes_Transferred'],
+        'User_Agent': from_codes(columns['User_Agent'], USER_AGENT_DTYPE),
+        'Time_Elapsed': columns['Time_Elapsed'],
+    }, columns=log_columns)
+
+# Generate a sample of web server logs as a DataFrame, column by column
+def generate_sample_logs_batch(num_logs, seed=None):
+    """
+    Vectorized counterpart of generate_sample_logs.
+
+    Parameters:
+    num_logs (int): The number of log rows to generate.
+    seed (int): Optional seed; the same seed always yields the same logs.
+
+    Returns:
+    pd.DataFrame: The generated logs, with the same columns as pd.DataFrame(generate_sample_logs(num_logs)).
+    """
+    return log_columns_to_frame(generate_log_columns(num_logs, np.random.default_rng(seed)))
+
 # Initialize Flask app
 app = Flask(__name__)
 
-# In-memory storage for logs
-logs_df = pd.DataFrame(columns=['IP', 'Country', 'Timestamp', 'Sport', 'Status_Code', 'Bytes_Transferred', 'User_Agent', 'Time_Elapsed'])
+# Maximum number of log rows kept in memory; older rows are evicted first
+LOG_STORE_CAPACITY = int(os.environ.get('LOG_STORE_CAPACITY', 1_000_000))
+
+# Shared-memory segment (e.g. /dev/shm/funolympics-logs) filled by a separate producer process;
+# when unset the store lives in this process and is filled by a producer thread
+LOG_STORE_PATH = os.environ.get('LOG_STORE_PATH')
+
+# Command line of `python log_server.py`
+def parse_args():
+    import argparse
+    parser = argparse.ArgumentParser(description='FunOlympics log server')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=0,
+                        help='Serve with this many gunicorn workers and a separate log producer (default: Flask dev server)')
+    parser.add_argument('--store-path', default='/dev/shm/funolympics-logs')
+    return parser.parse_args()
+
+# `python log_server.py --workers N` only supervises gunicorn workers and a producer process,
+# which open the shared store themselves, so it keeps no store or producer of its own
+SUPERVISOR = __name__ == '__main__' and parse_args().workers > 0
+
+# In-memory storage for logs, kept as columns of codes and numbers
+log_dtypes = {name: column.dtype for name, column in generate_log_columns(0).items()}
+if LOG_STORE_PATH:
+    log_store = SharedRingBuffer(LOG_STORE_PATH, log_dtypes)
+elif SUPERVISOR:
+    log_store = None
+else:
+    log_store = ColumnarRingBuffer(LOG_STORE_CAPACITY, log_dtypes)
+
+# Directory for the on-disk Parquet archive of every generated log; archiving is off when unset
+LOG_ARCHIVE_DIR = os.environ.get('LOG_ARCHIVE_DIR')
+LOG_ARCHIVE_FLUSH_ROWS = int(os.environ.get('LOG_ARCHIVE_FLUSH_ROWS', 100_000))
+
+if LOG_ARCHIVE_DIR:
+    from log_archive import LogArchive
+    log_archive = LogArchive(LOG_ARCHIVE_DIR, flush_rows=LOG_ARCHIVE_FLUSH_ROWS)
+    atexit.register(log_archive.flush)
+else:
+    log_archive = None
+
+# Store a freshly generated batch in memory and, when enabled, in the archive
+def ingest_log_columns(columns):
+    with span('server.ingest'):
+        log_store.append(columns)
+    if log_archive is not None:
+        with span('server.archive_write'):
+            log_archive.write(log_columns_to_frame(columns, epoch_timestamps=True))
+
+# Background log generation: base rate in logs per second, burst profile and burst cycle length in seconds
+LOG_PRODUCER_RATE = float(os.environ.get('LOG_PRODUCER_RATE', 500))
+LOG_PRODUCER_PROFILE = os.environ.get('LOG_PRODUCER_PROFILE', 'steady')
+LOG_PRODUCER_PERIOD = float(os.environ.get('LOG_PRODUCER_PERIOD', 600))
+
+# Producer thread for the in-process store; started with the dev server (see __main__) or,
+# under any other WSGI server, by the first request. A shared store is filled by the producer process instead.
+if LOG_STORE_PATH or SUPERVISOR:
+    producer = None
+else:
+    producer = LogProducer(generate_log_columns, ingest_log_columns, LOG_PRODUCER_RATE, LOG_PRODUCER_PROFILE, LOG_PRODUCER_PERIOD)
+    REGISTRY.callback_counter('funolympics_producer_rows_total', 'Rows generated by this process\'s log producer.', lambda: producer.produced)
 
 @app.route('/logs', methods=['POST'])
 def generate_and_receive_logs():
-    global logs_df
+    if LOG_STORE_PATH:
+        return jsonify({"error": "Logs are generated by the producer process"}), 409
     num_logs = int(request.json.get('num_logs', 10000))  # Default to 10000 logs
-    new_logs = generate_sample_logs(num_logs)
-    new_logs_df = pd.DataFrame(new_logs)
-    logs_df = pd.concat([logs_df, new_logs_df], ignore_index=True)
+    ingest_log_columns(generate_log_columns(num_logs))
     return jsonify({"message": "Logs generated and received successfully"}), 200
 
+# Pick the response format from ?format= or the Accept header, defaulting to JSON records
+def negotiate_log_format():
+    offered = log_wire.supported_formats()
+    requested = request.args.get('format')
+    if requested is not None:
+        mimetype = log_wire.FORMAT_NAMES.get(requested)
+        return mimetype if mimetype in offered else None
+    if not request.accept_mimetypes:
+        return log_wire.JSON
+    return request.accept_mimetypes.best_match([log_wire.JSON] + [f for f in offered if f != log_wire.JSON])
+
+# Pick a response compression the client accepts, if any
+def negotiate_encoding():
+    for encoding in log_wire.content_encodings():
+        if request.accept_encodings.quality(encoding) > 0:
+            return encoding
+    return None
+
+# Request metrics: latency up to the first byte, plus rows and bytes sent per endpoint
+request_seconds = REGISTRY.histogram('funolympics_request_seconds', 'Request handling time until the response starts streaming.')
+response_rows = REGISTRY.histogram('funolympics_response_rows', 'Log rows per response.', SIZE_BUCKETS)
+response_bytes = REGISTRY.histogram('funolympics_response_bytes', 'Body bytes per streamed response, after compression.', SIZE_BUCKETS)
+REGISTRY.gauge('funolympics_log_store_rows', 'Rows held in the log store.', lambda: len(log_store))
+REGISTRY.gauge('funolympics_log_store_capacity', 'Maximum rows the log store holds.', lambda: log_store.capacity)
+REGISTRY.callback_counter('funolympics_log_store_appended_total', 'Rows appended to the log store since it was created.', lambda: log_store.total_appended)
+REGISTRY.callback_counter('funolympics_log_store_evicted_total', 'Rows evicted from the log store.', lambda: log_store.evicted)
+REGISTRY.gauge('funolympics_log_store_bytes', 'Memory used by the log store columns.', lambda: log_store.nbytes)
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.before_request
+def ensure_log_producer():
+    if not LOG_STORE_PATH:
+        producer.start()
+
+@app.after_request
+def record_request_time(response):
+    if REGISTRY.enabled and 'request_started' in g:
+        request_seconds.observe(time.perf_counter() - g.request_started, endpoint=request.endpoint or 'unknown')
+    return response
+
+# A shared store left mid-write by a dead producer process cannot be read consistently
+@app.errorhandler(TimeoutError)
+def log_store_stale(error):
+    return jsonify({"error": str(error)}), 503
+
+# Prometheus scrape endpoint
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    return Response(REGISTRY.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+# Logs are produced in the background, so reads never generate rows
 @app.route('/logs', methods=['GET'])
 def get_logs():
-    global logs_df
-    num_logs = int(request.args.get('num_logs', 10000))  # Default to 10000 logs
-    new_logs = generate_sample_logs(num_logs)
-    new_logs_df = pd.DataFrame(new_logs)
-    logs_df = pd.concat([logs_df, new_logs_df], ignore_index=True)
-    latest_logs = logs_df.tail(num_logs).to_dict(orient='records')
-    return jsonify(latest_logs), 200
+    num_logs = int(request.args.get('num_logs', 10000))  # Newest 10000 logs by default
+    mimetype = negotiate_log_format()
+    if mimetype is None:
+        return jsonify({"error": "Unsupported log format", "formats": log_wire.supported_formats()}), 406
+    # With ?since=<seq> only rows appended after that cursor are returned, up to ?limit=
+    since = request.args.get('since', type=int)
+    with span('logs.read'):
+        if since is None:
+            columns, first_seq, next_seq = log_store.since(0, limit=num_logs)
+        else:
+            columns, first_seq, next_seq = log_store.since(since, limit=request.args.get('limit', 10000, type=int))
+    # Only the original JSON records format keeps string timestamps, for older clients
+    with span('logs.frame'):
+        latest_logs = log_columns_to_frame(columns, epoch_timestamps=mimetype != log_wire.JSON)
+    if REGISTRY.enabled:
+        response_rows.observe(len(latest_logs), endpoint=request.endpoint)
+    headers = {'X-Log-Seq-Start': str(first_seq), 'X-Log-Next-Seq': str(next_seq)}
+    return log_frame_response(latest_logs, mimetype, headers)
+
+# Stream a log frame in the negotiated format
+def log_frame_response(frame, mimetype, headers=None):
+    return compressed_response(log_wire.encode_frame(frame, mimetype), mimetype, headers)
+
+# Wrap a chunked body in a response, compressed when the client accepts it
+def compressed_response(body, mimetype, headers=None):
+    headers = dict(headers or {}, Vary='Accept, Accept-Encoding')
+    encoding = negotiate_encoding()
+    if encoding is not None:
+        body = log_wire.compress_chunks(body, encoding)
+        headers['Content-Encoding'] = encoding
+    # Serialization and compression run while the body streams, so they are timed chunk by chunk
+    endpoint = request.endpoint
+    body = REGISTRY.timed_chunks(body, f'{endpoint}.serialize',
+                                 lambda total_bytes: response_bytes.observe(total_bytes, endpoint=endpoint))
+    return Response(body, mimetype=mimetype, headers=headers), 200
+
+@app.route('/logs/stats', methods=['GET'])
+def get_log_stats():
+    stats = log_store.stats()
+    if not LOG_STORE_PATH:
+        stats['producer'] = producer.stats()
+    return jsonify(stats), 200
+
+# Stats of recent store positions. The producer moves the position every tick (0.25 s by default),
+# so this only saves work for requests that arrive within the same tick, such as dashboards
+# refreshing together; most requests compute their stats afresh.
+STATS_CACHE_SIZE = 64
+_stats_cache = OrderedDict()
+_stats_cache_lock = threading.Lock()
+
+# Stats of `columns`, the newest `window` rows read at store position next_seq
+def log_stats_at(columns, next_seq, window, country, sports, panels):
+    key = (next_seq, window, country, sports, panels)
+    with _stats_cache_lock:
+        if key in _stats_cache:
+            _stats_cache.move_to_end(key)
+            return _stats_cache[key]
+    stats = compute_log_stats(columns, country, sports, panels)
+    with _stats_cache_lock:
+        _stats_cache[key] = stats
+        while len(_stats_cache) > STATS_CACHE_SIZE:
+            _stats_cache.popitem(last=False)
+    return stats
+
+def clear_stats_cache():
+    with _stats_cache_lock:
+        _stats_cache.clear()
+
+# Panel aggregates over the newest ?window= rows, optionally filtered by ?country= and ?sports=a,b
+@app.route('/stats', methods=['GET'])
+@app.route('/stats/<panel>', methods=['GET'])
+def get_stats(panel=None):
+    if panel is not None and panel not in PANELS:
+        return jsonify({"error": f"Unknown stats panel: {panel}", "panels": PANELS}), 404
+    window = request.args.get('window', 10000, type=int)
+    country = request.args.get('country')
+    sports = [sport for value in request.args.getlist('sports') for sport in value.split(',') if sport]
+    # Rows and store position come from one consistent read, so the stats match the reported next_seq
+    columns, first_seq, next_seq = log_store.since(0, limit=max(window, 0))
+    with span('stats.compute'):
+        stats = log_stats_at(columns, next_seq, window, country, tuple(sports) if sports else None,
+                             (panel,) if panel else tuple(DEFAULT_PANELS))
+    payload = dict(stats, window=next_seq - first_seq, next_seq=next_seq)
+    return compressed_response(iter([app.json.dumps(payload).encode()]), log_wire.JSON)
+
+# Parse the ?start and ?end archive bounds; None for an omitted bound, ValueError for a malformed one
+def archive_bounds():
+    bounds = []
+    for name in ('start', 'end'):
+        value = request.args.get(name)
+        if value is None:
+            bounds.append(None)
+            continue
+        bound = pd.Timestamp(value)
+        if pd.isna(bound):
+            raise ValueError(f"Invalid {name}: {value!r}")
+        bounds.append(bound)
+    return bounds
+
+# Archived logs with ?start <= Timestamp < ?end (ISO dates or datetimes), optionally only ?columns=a,b
+@app.route('/archive/logs', methods=['GET'])
+def get_archived_logs():
+    if log_archive is None:
+        return jsonify({"error": "Log archive is not enabled; set LOG_ARCHIVE_DIR"}), 404
+    mimetype = negotiate_log_format()
+    if mimetype is None:
+        return jsonify({"error": "Unsupported log format", "formats": log_wire.supported_formats()}), 406
+    try:
+        start, end = archive_bounds()
+    except ValueError as error:
+        return jsonify({"error": f"Invalid time range: {error}"}), 400
+    columns = request.args.get('columns')
+    archived_logs = log_archive.read(start, end, columns=columns.split(',') if columns else None)
+    if 'Timestamp' in archived_logs.columns:
+        epochs = archived_logs['Timestamp'].to_numpy(dtype='datetime64[s]').astype(np.int64)
+        archived_logs['Timestamp'] = epochs if mimetype != log_wire.JSON else format_timestamps(epochs)
+    return log_frame_response(archived_logs, mimetype)
+
+# Archived views per day for ?start..?end (inclusive dates), read from Parquet metadata only
+@app.route('/archive/daily', methods=['GET'])
+def get_archived_daily_views():
+    if log_archive is None:
+        return jsonify({"error": "Log archive is not enabled; set LOG_ARCHIVE_DIR"}), 404
+    try:
+        start, end = archive_bounds()
+    except ValueError as error:
+        return jsonify({"error": f"Invalid time range: {error}"}), 400
+    daily_views = log_archive.daily_counts(start, end)
+    return jsonify({'Date': daily_views['Date'].dt.strftime('%Y-%m-%d').tolist(), 'Views': daily_views['Views'].tolist()}), 200
+
+# Run the app under gunicorn with several worker processes sharing one log store
+def serve(workers, port=5000, store_path='/dev/shm/funolympics-logs'):
+    """
+    Production mode: creates the shared log store, starts the producer process that
+    fills it, and serves the app from `workers` gunicorn workers that read it.
+
+    Parameters:
+    workers (int): The number of server worker processes.
+    port (int): The port to listen on.
+    store_path (str): The shared-memory segment backing the log store.
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        raise SystemExit("Production mode needs gunicorn: pip install gunicorn")
+    import log_producer
+
+    SharedRingBuffer(store_path, log_dtypes, capacity=LOG_STORE_CAPACITY, create=True)
+    os.environ['LOG_STORE_PATH'] = store_path
+    producer_process = log_producer.start_process(store_path, LOG_PRODUCER_RATE, LOG_PRODUCER_PROFILE, LOG_PRODUCER_PERIOD)
+
+    class LogServerApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f'0.0.0.0:{port}')
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', 4)
+
+        def load(self):
+            # Each worker imports the app afresh, so it attaches to the shared store
+            from log_server import app as worker_app
+            return worker_app
+
+    try:
+        LogServerApplication().run()
+    finally:
+        producer_process.terminate()
+        producer_process.join()
+        # Free the shared memory; nothing attaches to the segment once workers and producer are gone
+        try:
+            os.unlink(store_path)
+        except FileNotFoundError:
+            pass
 
 if __name__ == '__main__':
-    app.run(port=5000) 
+    args = parse_args()
+    if args.workers > 0:
+        serve(args.workers, args.port, args.store_path)
+    else:
+        producer.start()
+        app.run(port=args.port) 
@@ -0,0 +1,116 @@
+"""
+Server-side aggregates for the dashboard panels.
+
+Stats are computed straight from the log store's code columns with bincount
+and integer arithmetic, so a response carries a few KB of counts instead of
+the raw rows they were computed from.
+"""
+import numpy as np
+
+from schema import BROWSER_DTYPE, COUNTRY_DTYPE, DEVICE_DTYPE, SPORT_DTYPE, STATUS_CODE_DTYPE, USER_AGENT_DTYPE, from_codes
+from sketches import LogSketches
+from ua_classifier import classify_user_agent
+
+# Device and browser code of each schema user agent, indexed by user agent code
+DEVICE_BY_USER_AGENT = np.array([DEVICE_DTYPE.categories.get_loc(classify_user_agent(ua)[0]) for ua in USER_AGENT_DTYPE.categories])
+BROWSER_BY_USER_AGENT = np.array([BROWSER_DTYPE.categories.get_loc(classify_user_agent(ua)[1]) for ua in USER_AGENT_DTYPE.categories])
+
+PANELS = ['summary', 'sports', 'countries', 'devices', 'browsers', 'status_codes',
+          'country_sports', 'daily', 'monthly', 'month_sports', 'heatmap', 'sketches', 'sketch_state']
+
+# Panels sent when none is asked for; the mergeable sketch state (~10 KB) only on request
+DEFAULT_PANELS = [panel for panel in PANELS if panel != 'sketch_state']
+
+
+def _counts(codes, dtype):
+    counts = np.bincount(codes, minlength=len(dtype.categories))
+    return {str(category): int(count) for category, count in zip(dtype.categories, counts) if count}
+
+
+def filter_mask(columns, country=None, sports=None):
+    """
+    Selects rows from one country and/or a list of sports; unknown names match nothing.
+    """
+    mask = np.ones(len(columns['Country']), dtype=bool)
+    if country is not None:
+        code = COUNTRY_DTYPE.categories.get_indexer([country])[0]
+        mask &= columns['Country'] == code
+    if sports is not None:
+        codes = SPORT_DTYPE.categories.get_indexer(list(sports))
+        mask &= np.isin(columns['Sport'], codes[codes >= 0])
+    return mask
+
+
+def compute_log_stats(columns, country=None, sports=None, panels=PANELS):
+    """
+    Aggregates log columns (as stored in the log store) into the dashboard panels.
+
+    Parameters:
+    columns (dict): Column name to array of codes/values, e.g. from ColumnarRingBuffer.tail.
+    country (str): Only count rows from this country.
+    sports (list): Only count rows for these sports.
+    panels (list): Which of PANELS to compute.
+
+    Returns:
+    dict: Panel name to a JSON-serializable aggregate.
+    """
+    if country is not None or sports is not None:
+        mask = filter_mask(columns, country, sports)
+        columns = {name: values[mask] for name, values in columns.items()}
+    country_codes = columns['Country'].astype(np.intp)
+    sport_codes = columns['Sport'].astype(np.intp)
+    user_agent_codes = columns['User_Agent'].astype(np.intp)
+    days = columns['Timestamp'] // 86400
+    months = days.astype('datetime64[D]').astype('datetime64[M]')
+    num_sports = len(SPORT_DTYPE.categories)
+
+    stats = {}
+    if 'summary' in panels:
+        elapsed = columns['Time_Elapsed']
+        stats['summary'] = {
+            'visits': int(len(elapsed)),
+            'avg_response_time': float(elapsed.mean()) if len(elapsed) else None,
+            'countries': int(np.count_nonzero(np.bincount(country_codes))),
+        }
+    if 'sports' in panels:
+        stats['sports'] = _counts(sport_codes, SPORT_DTYPE)
+    if 'countries' in panels:
+        stats['countries'] = _counts(country_codes, COUNTRY_DTYPE)
+    if 'devices' in panels:
+        stats['devices'] = _counts(DEVICE_BY_USER_AGENT[user_agent_codes], DEVICE_DTYPE)
+    if 'browsers' in panels:
+        stats['browsers'] = _counts(BROWSER_BY_USER_AGENT[user_agent_codes], BROWSER_DTYPE)
+    if 'status_codes' in panels:
+        stats['status_codes'] = _counts(columns['Status_Code'].astype(np.intp), STATUS_CODE_DTYPE)
+    if 'country_sports' in panels:
+        # Dense country x sport matrix in schema order, so any country filter can be answered locally
+        matrix = np.bincount(country_codes * num_sports + sport_codes, minlength=len(COUNTRY_DTYPE.categories) * num_sports)
+        stats['country_sports'] = matrix.reshape(-1, num_sports).tolist()
+    if 'daily' in panels:
+        unique_days, counts = np.unique(days, return_counts=True)
+        stats['daily'] = {'Date': [str(day) for day in unique_days.astype('datetime64[D]')], 'Views': counts.tolist()}
+    if 'monthly' in panels:
+        unique_months, counts = np.unique(months, return_counts=True)
+        stats['monthly'] = {'Month': [str(month) for month in unique_months], 'Views': counts.tolist()}
+    if 'month_sports' in panels:
+        month_index = months.astype(np.int64)
+        keys, counts = np.unique(month_index * num_sports + sport_codes, return_counts=True)
+        stats['month_sports'] = {
+            'Month': [str(month) for month in (keys // num_sports).astype('datetime64[M]')],
+            'Sport': [str(SPORT_DTYPE.categories[code]) for code in keys % num_sports],
+            'Views': counts.tolist(),
+        }
+    if 'heatmap' in panels:
+        hours = columns['Timestamp'] // 3600 % 24
+        weekdays = (days + 3) % 7  # 1970-01-01 was a Thursday; 0 is Monday
+        stats['heatmap'] = np.bincount(hours * 7 + weekdays, minlength=24 * 7).reshape(24, 7).tolist()
+    if 'sketches' in panels or 'sketch_state' in panels:
+        # Unique IPs, top-K and response time percentiles; the state can be merged across workers
+        sketches = LogSketches()
+        sketches.update(columns['IP'], from_codes(country_codes, COUNTRY_DTYPE), from_codes(sport_codes, SPORT_DTYPE),
+                        columns['Time_Elapsed'])
+        if 'sketches' in panels:
+            stats['sketches'] = sketches.summary()
+        if 'sketch_state' in panels:
+            stats['sketch_state'] = sketches.to_dict()
+    return stats
@@ -0,0 +1,290 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+
+class ColumnarRingBuffer:
+    """
+    Fixed-capacity columnar store backed by preallocated NumPy arrays.
+
+    Appends cost O(batch) and tail(n) costs O(n); once the buffer is full the
+    oldest rows are overwritten. String columns are expected to arrive as
+    integer codes so every column has a fixed-width dtype.
+
+    One writer and any number of reader threads may use the buffer at once:
+    appends and reads are serialized by a lock, and reads return copies.
+
+    Parameters:
+    capacity (int): The maximum number of rows kept.
+    dtypes (dict): Column name to NumPy dtype, in column order.
+    """
+
+    def __init__(self, capacity, dtypes):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = int(capacity)
+        self.dtypes = {name: np.dtype(dtype) for name, dtype in dtypes.items()}
+        self._columns = {name: np.empty(self.capacity, dtype=dtype) for name, dtype in self.dtypes.items()}
+        self._head = 0  # Next write position
+        self._size = 0
+        self.total_appended = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def evicted(self):
+        return self.total_appended - self._size
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self._columns.values())
+
+    def append(self, columns):
+        """
+        Appends a batch of rows given as a dict of equal-length arrays.
+        """
+        lengths = {len(columns[name]) for name in self.dtypes}
+        if len(lengths) != 1:
+            raise ValueError("all columns must have the same length")
+        batch_size = lengths.pop()
+        if batch_size == 0:
+            return
+        with self._lock:
+            self._begin_write()
+            try:
+                self._append_locked(columns, batch_size)
+            finally:
+                self._end_write()
+
+    def _append_locked(self, columns, batch_size):
+        # Only the newest `capacity` rows of an oversized batch can survive
+        skip = max(0, batch_size - self.capacity)
+        count = batch_size - skip
+        start = (self._head + skip) % self.capacity
+        first = min(count, self.capacity - start)
+        for name, column in self._columns.items():
+            values = np.asarray(columns[name])[skip:]
+            column[start:start + first] = values[:first]
+            column[:count - first] = values[first:]
+
+        self._head = (start + count) % self.capacity
+        self._size = min(self._size + batch_size, self.capacity)
+        self.total_appended += batch_size
+
+    def _begin_write(self):
+        pass
+
+    def _end_write(self):
+        pass
+
+    def _read(self, read, *args):
+        """
+        Runs read(*args) against a consistent view of the buffer.
+        """
+        with self._lock:
+            return read(*args)
+
+    def tail(self, n):
+        """
+        Returns copies of the newest n rows, oldest first, as a dict of arrays.
+        """
+        return self._read(self._tail, n)
+
+    def _tail(self, n):
+        n = max(0, min(int(n), self._size))
+        start = (self._head - n) % self.capacity
+        if start + n <= self.capacity:
+            return {name: column[start:start + n].copy() for name, column in self._columns.items()}
+        return {name: np.concatenate([column[start:], column[:self._head]]) for name, column in self._columns.items()}
+
+    @property
+    def next_seq(self):
+        """
+        Sequence number the next appended row will get; rows are numbered from 0 in append order.
+        """
+        return self.total_appended
+
+    @property
+    def first_seq(self):
+        """
+        Sequence number of the oldest row still held.
+        """
+        return self.total_appended - self._size
+
+    def since(self, seq, limit=None):
+        """
+        Returns the rows appended at or after sequence number `seq`.
+
+        Rows already evicted are skipped, and when more than `limit` rows match only the
+        newest `limit` are returned.
+
+        Returns:
+        tuple: (dict of arrays, sequence number of the first returned row, sequence number
+        to ask for next). Both numbers are taken from the same consistent read as the rows,
+        so a cursor built from them never skips rows appended concurrently.
+        """
+        return self._read(self._since, seq, limit)
+
+    def _since(self, seq, limit):
+        next_seq = self.total_appended
+        count = next_seq - max(int(seq), next_seq - self._size)
+        if limit is not None:
+            count = min(count, int(limit))
+        count = max(count, 0)
+        return self._tail(count), next_seq - count, next_seq
+
+    def stats(self):
+        return self._read(self._stats)
+
+    def _stats(self):
+        return {
+            'capacity': self.capacity,
+            'size': self._size,
+            'total_appended': self.total_appended,
+            'evicted': self.evicted,
+            'memory_bytes': self.nbytes,
+        }
+
+
+class SharedRingBuffer(ColumnarRingBuffer):
+    """
+    ColumnarRingBuffer kept in a memory-mapped file, so several server worker
+    processes can read the log store that a single producer process writes.
+
+    The file holds a small header (capacity, write position, row counts and a
+    version counter) and the dtype of every column, followed by one fixed-width
+    array per column. Use a path on a RAM-backed filesystem such as /dev/shm to
+    keep it in shared memory.
+
+    Readers never block the writer. The writer makes the version odd while it
+    is changing the buffer and even again when done (a seqlock); a reader copies
+    what it needs and retries if the version was odd or moved in the meantime.
+    A writer killed mid-append leaves the version odd for good, so a reader gives
+    up with TimeoutError after READ_TIMEOUT seconds instead of spinning forever.
+
+    Parameters:
+    path (str): The segment file.
+    dtypes (dict): Column name to NumPy dtype, in column order; must match the writer's.
+    capacity (int): The maximum number of rows kept; required with create=True,
+        otherwise read from the segment.
+    create (bool): Create (or reset) the segment instead of attaching to an existing one.
+    writable (bool): Open for appending. Only one process may write to a segment.
+    """
+
+    MAGIC = 0x46554E4F4C4F4753  # "FUNOLOGS"
+    HEADER_SLOTS = 8
+    READ_TIMEOUT = 5.0
+    _MAGIC, _CAPACITY, _VERSION, _HEAD, _SIZE, _TOTAL, _COLUMNS = range(7)
+
+    def __init__(self, path, dtypes, capacity=None, create=False, writable=False):
+        self.path = path
+        self.dtypes = {name: np.dtype(dtype) for name, dtype in dtypes.items()}
+        self.writable = create or writable
+        if create:
+            if capacity is None or capacity <= 0:
+                raise ValueError("capacity must be positive")
+            capacity = int(capacity)
+            with open(path, 'wb') as segment:
+                segment.truncate(self._layout(capacity)[1])
+            header = np.memmap(path, dtype=np.int64, mode='r+', shape=(self.HEADER_SLOTS + len(self.dtypes),))
+            header[:] = 0
+            header[self._CAPACITY] = capacity
+            header[self._COLUMNS] = len(self.dtypes)
+            header[self.HEADER_SLOTS:] = [self._dtype_code(dtype) for dtype in self.dtypes.values()]
+            header[self._MAGIC] = self.MAGIC
+            header.flush()
+            del header
+        mode = 'r+' if self.writable else 'r'
+        self._header = np.memmap(path, dtype=np.int64, mode=mode, shape=(self.HEADER_SLOTS,))
+        if self._header[self._MAGIC] != self.MAGIC:
+            raise ValueError(f"{path} is not a log store segment")
+        if self._header[self._COLUMNS] != len(self.dtypes):
+            raise ValueError(f"{path} holds {self._header[self._COLUMNS]} columns, expected {len(self.dtypes)}")
+        self.capacity = int(self._header[self._CAPACITY])
+        codes = np.memmap(path, dtype=np.int64, mode='r', offset=self.HEADER_SLOTS * 8, shape=(len(self.dtypes),))
+        for (name, dtype), code in zip(self.dtypes.items(), codes):
+            if code != self._dtype_code(dtype):
+                raise ValueError(f"{path} stores column {name} as {self._dtype_name(code)}, expected {dtype.str}")
+        offsets, size = self._layout(self.capacity)
+        if os.path.getsize(path) != size:
+            raise ValueError(f"{path} does not match the expected column layout")
+        self._columns = {
+            name: np.memmap(path, dtype=dtype, mode=mode, offset=offsets[name], shape=(self.capacity,))
+            for name, dtype in self.dtypes.items()
+        }
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _dtype_code(dtype):
+        # The dtype string, e.g. '<i8', packed into one header slot
+        return int(np.frombuffer(dtype.str.encode('ascii').ljust(8, b'\0'), dtype=np.int64)[0])
+
+    @staticmethod
+    def _dtype_name(code):
+        return np.int64(code).tobytes().rstrip(b'\0').decode('ascii', 'replace')
+
+    def _layout(self, capacity):
+        """
+        Returns the byte offset of each column and the total segment size; columns are 64-byte aligned.
+        """
+        offsets = {}
+        position = (self.HEADER_SLOTS + len(self.dtypes)) * 8
+        for name, dtype in self.dtypes.items():
+            offsets[name] = position
+            position += -(-capacity * dtype.itemsize // 64) * 64
+        return offsets, position
+
+    @property
+    def _head(self):
+        return int(self._header[self._HEAD])
+
+    @_head.setter
+    def _head(self, value):
+        self._header[self._HEAD] = value
+
+    @property
+    def _size(self):
+        return int(self._header[self._SIZE])
+
+    @_size.setter
+    def _size(self, value):
+        self._header[self._SIZE] = value
+
+    @property
+    def total_appended(self):
+        return int(self._header[self._TOTAL])
+
+    @total_appended.setter
+    def total_appended(self, value):
+        self._header[self._TOTAL] = value
+
+    def append(self, columns):
+        if not self.writable:
+            raise PermissionError(f"log store segment {self.path} is open read-only")
+        super().append(columns)
+
+    def _begin_write(self):
+        self._header[self._VERSION] += 1
+
+    def _end_write(self):
+        self._header[self._VERSION] += 1
+
+    def _read(self, read, *args):
+        deadline = time.monotonic() + self.READ_TIMEOUT
+        while True:
+            version = int(self._header[self._VERSION])
+            if version % 2 == 0:
+                result = read(*args)
+                if int(self._header[self._VERSION]) == version:
+                    return result
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"log store segment {self.path} has been mid-write for {self.READ_TIMEOUT}s; "
+                                   "its producer may have died")
+            time.sleep(0)
+
+    def _stats(self):
+        return dict(super()._stats(), path=self.path)
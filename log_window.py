@@ -0,0 +1,46 @@
+import pandas as pd
+
+
+class LogWindow:
+    """
+    Rolling window of the most recent log rows kept by the dashboard.
+
+    New rows are appended as they arrive from the server's sequence cursor and
+    the oldest rows fall out once the window is full, so each poll only has to
+    transfer the delta.
+
+    Parameters:
+    size (int): The maximum number of rows kept.
+    """
+
+    def __init__(self, size):
+        self.size = int(size)
+        self.frame = pd.DataFrame()
+        self.cursor = None  # Sequence number to request next, None until the server reports one
+
+    def __len__(self):
+        return len(self.frame)
+
+    def extend(self, new_rows, next_seq):
+        """
+        Adds freshly fetched rows and advances the cursor.
+
+        When the server does not report a cursor (next_seq is None) the fetched rows
+        replace the whole window, as the original polling loop did.
+
+        Returns:
+        tuple: (rows added, rows evicted) as DataFrames. Added rows that did not fit
+        in the window show up in the evicted frame as well.
+        """
+        self.cursor = next_seq
+        if new_rows.empty:
+            return new_rows, self.frame.iloc[:0]
+        if next_seq is None or self.frame.empty:
+            evicted = self.frame
+            self.frame = new_rows.tail(self.size).reset_index(drop=True)
+            return self.frame, evicted
+        frame = pd.concat([self.frame, new_rows], ignore_index=True)
+        excess = max(0, len(frame) - self.size)
+        evicted = frame.iloc[:excess]
+        self.frame = frame.iloc[excess:].reset_index(drop=True)
+        return new_rows, evicted
@@ -0,0 +1,163 @@
+"""
+Wire formats for shipping log frames between log_server.py and the dashboard.
+
+Besides the original list-of-records JSON, GET /logs can serve Apache Arrow IPC
+streams (when pyarrow is installed), column-oriented JSON and NDJSON. The
+streaming formats are written in chunks so large responses never have to be
+built in memory as one document. The dashboard asks for Arrow or NDJSON;
+column-oriented JSON is only served when requested with ?format=columns.
+"""
+import io
+import json
+import zlib
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow is optional; the JSON formats always work
+    pa = None
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; gzip is always available
+    zstandard = None
+
+JSON = 'application/json'
+COLUMNS_JSON = 'application/vnd.funolympics.columns+json'
+NDJSON = 'application/x-ndjson'
+ARROW_STREAM = 'application/vnd.apache.arrow.stream'
+
+# Short names accepted through the ?format= query parameter
+FORMAT_NAMES = {
+    'json': JSON,
+    'columns': COLUMNS_JSON,
+    'ndjson': NDJSON,
+    'arrow': ARROW_STREAM,
+}
+
+# Rows per chunk for the streamed formats
+CHUNK_SIZE = 5000
+
+
+def supported_formats():
+    """
+    Returns the mimetypes this process can encode and decode, most compact first.
+    """
+    formats = [COLUMNS_JSON, NDJSON, JSON]
+    if pa is not None:
+        formats.insert(0, ARROW_STREAM)
+    return formats
+
+
+def preferred_formats():
+    """
+    Returns the mimetypes a client should ask for, best first.
+
+    Column-oriented JSON is left out: decoding it goes through json.loads, which builds
+    a Python object per value, while Arrow decodes straight into columns and NDJSON is
+    parsed by pandas. Servers still encode it for clients that ask with ?format=columns.
+    """
+    return [mimetype for mimetype in supported_formats() if mimetype != COLUMNS_JSON]
+
+
+def accept_header():
+    """
+    Builds an Accept header that prefers the most compact format the client decodes well.
+    """
+    formats = preferred_formats()
+    return ', '.join(f'{mimetype};q={1 - index / 10:.1f}' for index, mimetype in enumerate(formats))
+
+
+def encode_frame(frame, mimetype, chunk_size=CHUNK_SIZE):
+    """
+    Encodes a DataFrame in the given wire format.
+
+    Parameters:
+    frame (pd.DataFrame): The frame to encode.
+    mimetype (str): One of supported_formats().
+    chunk_size (int): Rows per chunk for the streamed formats.
+
+    Returns:
+    iterator of bytes: The encoded body, chunked for NDJSON and Arrow.
+    """
+    if mimetype == ARROW_STREAM:
+        return _encode_arrow(frame, chunk_size)
+    if mimetype == NDJSON:
+        return _encode_ndjson(frame, chunk_size)
+    if mimetype == COLUMNS_JSON:
+        return iter([_encode_columns(frame)])
+    if mimetype == JSON:
+        return iter([frame.to_json(orient='records').encode()])
+    raise ValueError(f"Unsupported log format: {mimetype}")
+
+
+def decode_frame(content, mimetype):
+    """
+    Decodes a response body produced by encode_frame back into a DataFrame.
+    """
+    mimetype = (mimetype or JSON).split(';')[0].strip()
+    if not content:
+        return pd.DataFrame()
+    if mimetype == ARROW_STREAM:
+        if pa is None:
+            raise ValueError("pyarrow is required to decode Arrow responses")
+        return pa.ipc.open_stream(content).read_pandas()
+    if mimetype == NDJSON:
+        return pd.read_json(io.BytesIO(content), lines=True, convert_dates=False)
+    if mimetype == COLUMNS_JSON:
+        return pd.DataFrame(json.loads(content))
+    return pd.read_json(io.BytesIO(content), orient='records', convert_dates=False)
+
+
+def _encode_columns(frame):
+    # Each column goes through pandas' C JSON encoder instead of Python dicts per row
+    parts = [f'{json.dumps(str(name))}:{frame[name].to_json(orient="values")}' for name in frame.columns]
+    return ('{' + ','.join(parts) + '}').encode()
+
+
+def _encode_ndjson(frame, chunk_size):
+    for start in range(0, len(frame), chunk_size):
+        chunk = frame.iloc[start:start + chunk_size].to_json(orient='records', lines=True)
+        yield chunk.encode() if chunk.endswith('\n') else (chunk + '\n').encode()
+
+
+def _encode_arrow(frame, chunk_size):
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=chunk_size):
+            writer.write_batch(batch)
+            yield _drain(sink)
+    yield _drain(sink)
+
+
+def _drain(sink):
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
+
+
+def content_encodings():
+    """
+    Returns the response compressions this process can produce, preferred first.
+    """
+    return ['zstd', 'gzip'] if zstandard is not None else ['gzip']
+
+
+def compress_chunks(chunks, encoding):
+    """
+    Compresses an iterator of byte chunks as one gzip or zstd stream, without buffering the whole body.
+    """
+    if encoding == 'gzip':
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    elif encoding == 'zstd' and zstandard is not None:
+        compressor = zstandard.ZstdCompressor().compressobj()
+    else:
+        raise ValueError(f"Unsupported content encoding: {encoding}")
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
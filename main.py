@@ -1,46 +1,159 @@
 import streamlit as st
 import pandas as pd
-import requests
+import os
 import time
 import datetime
-import re
-import altair as alt  # Import Altair
-import numpy as np
-import plotly.express as px
-import warnings 
-from collections import defaultdict
+import warnings
+from log_window import LogWindow
+from aggregates import LogAggregates, ServerStats
+from ingest import format_timestamps, prepare_logs
+from render import PanelRenderer
+from metrics import REGISTRY, span
+from schema import olympic_countries, sports
 warnings.filterwarnings('ignore')
 
 # Set page width to wide
 st.set_page_config(page_title="FunOlympics Dashboard", layout="wide")
 
-# Function to fetch logs from Flask API
-def fetch_logs(num_logs=10000):
-    response = requests.get(f"https://bida20.pythonanywhere.com//logs?num_logs={num_logs}")
-    if response.status_code == 200:
-        logs = response.json()
-        df = pd.DataFrame(logs)
-        return df
-    else:
-        st.error("Failed to fetch logs from server.")
-        return pd.DataFrame()
+# Rows kept in the dashboard's rolling window, and new rows requested per refresh
+LOG_WINDOW_SIZE = 10000
+LOG_BATCH_SIZE = 1000
+
+# Seconds between refreshes, and whether the next batch downloads while the current one renders
+REFRESH_INTERVAL = 3
+PREFETCH_LOGS = os.environ.get('FUNOLYMPICS_PREFETCH', '1') != '0'
+
+# Seconds a cached initial window or history query is reused by new sessions and reruns
+INITIAL_LOAD_TTL = 60
+HISTORY_TTL = 300
 
-def sample_logs(logs_df):
-    """
-    Randomly samples a number of records from the given logs DataFrame.
+# Local snapshot painted first, while the live window loads
+SNAPSHOT_CSV = 'Funolympics_data.csv'
 
-    Parameters:
-    logs_df (pd.DataFrame): The DataFrame containing log records.
+# Pooled client for the log server, shared by all sessions (set FUNOLYMPICS_LOG_SERVER to use a local log_server.py).
+# requests and the client are only imported once the first paint is on screen.
+@st.cache_resource
+def get_log_client():
+    from log_client import LogClient
+    return LogClient()
 
-    Returns:
-    pd.DataFrame: A DataFrame containing the sampled log records.
-    """
-    num_records_to_sample = np.random.randint(9000, 10001)
-    num_records_to_sample = min(num_records_to_sample, len(logs_df))
-    sampled_df = logs_df.sample(n=num_records_to_sample, random_state=42)
-    return sampled_df
+# Function to fetch logs from Flask API
+def fetch_log_delta(since=None, num_logs=10000):
+    import requests
+    try:
+        with span('dashboard.fetch_logs'):
+            return get_log_client().fetch_log_delta(since, num_logs, limit=state.log_window.size)
+    except requests.RequestException:
+        st.error("Failed to fetch logs from server.")
+        return pd.DataFrame(), since
+
+# Wait for a batch started by log_client.prefetch_log_delta
+def wait_for_log_delta(pending, since):
+    import requests
+    try:
+        with span('dashboard.wait_for_prefetch'):
+            return pending.result()
+    except requests.RequestException:
+        st.error("Failed to fetch logs from server.")
+        return pd.DataFrame(), since
 
-df = sample_logs(fetch_logs())
+def fetch_logs(num_logs=10000):
+    return fetch_log_delta(num_logs=num_logs)[0]
+
+# Local Parquet archive to read history from directly; the server's /archive endpoints are used when unset
+ARCHIVE_DIR = os.environ.get('FUNOLYMPICS_ARCHIVE_DIR')
+
+# Views per day from the log archive, counted from Parquet metadata without loading rows.
+# Server failures raise, so they are not cached.
+@st.cache_data(ttl=HISTORY_TTL, show_spinner=False)
+def load_daily_history(start, end):
+    if ARCHIVE_DIR:
+        from log_archive import LogArchive
+        return LogArchive(ARCHIVE_DIR).daily_counts(start, end)
+    return get_log_client().fetch_daily_history(start, end)
+
+# The bundled CSV snapshot, prepared once per server process
+@st.cache_data(show_spinner=False)
+def load_snapshot():
+    return prepare_logs(pd.read_csv(SNAPSHOT_CSV))
+
+# Whether the server computes panel aggregates itself; checked once per TTL rather than on every rerun.
+# An unreachable server raises, so the failure is not cached.
+@st.cache_data(ttl=INITIAL_LOAD_TTL, show_spinner=False)
+def server_supports_stats():
+    return get_log_client().supports_stats()
+
+# The newest num_logs rows and their cursor, shared by sessions that start within the TTL.
+# Failures raise, so they are not cached.
+@st.cache_data(ttl=INITIAL_LOAD_TTL, show_spinner=False)
+def load_initial_logs(num_logs):
+    return get_log_client().fetch_log_delta(num_logs=num_logs, limit=num_logs)
+
+# Servers with a /stats endpoint compute the panel aggregates themselves, so only the
+# rows shown in the data table are shipped; older servers send the whole window
+DATA_TABLE_ROWS = 1000
+
+# Rows per page of the data table
+DATA_PAGE_SIZE = 100
+
+# Panel aggregates over the newest LOG_WINDOW_SIZE rows from the server, keeping the last good ones on failure
+def fetch_server_stats(previous):
+    import requests
+    try:
+        with span('dashboard.fetch_stats'):
+            return ServerStats(get_log_client().fetch_stats(LOG_WINDOW_SIZE))
+    except requests.RequestException:
+        st.error("Failed to fetch stats from server.")
+        return previous
+
+# Rows to ask for per refresh. Servers without a cursor send a fresh batch that replaces the
+# window (see LogWindow.extend), so they are asked for a whole window rather than a delta.
+def poll_size():
+    if state.log_window.cursor is None:
+        return state.log_window.size
+    return LOG_BATCH_SIZE
+
+# Move a fetched batch of rows into the window and keep the panel aggregates in step
+def apply_log_delta(new_rows, next_seq):
+    with span('dashboard.prepare_logs'):
+        added, evicted = state.log_window.extend(prepare_logs(new_rows), next_seq)
+    if not state.use_server_stats:
+        with span('dashboard.aggregate'):
+            state.aggregates.update(added, evicted)
+
+# Replace the snapshot with the live window; returns False (keeping the snapshot) if the server is unreachable
+def go_live():
+    import requests
+    try:
+        with span('dashboard.initial_load'):
+            use_server_stats = server_supports_stats()
+            # With server stats the window only feeds the data table, so only that many rows are needed
+            window_size = DATA_TABLE_ROWS if use_server_stats else LOG_WINDOW_SIZE
+            new_rows, next_seq = load_initial_logs(window_size)
+    except requests.RequestException:
+        st.error("Failed to fetch logs from server.")
+        return False
+    state.use_server_stats = use_server_stats
+    state.log_window = LogWindow(window_size)
+    state.aggregates = LogAggregates(LOG_WINDOW_SIZE)
+    apply_log_delta(new_rows, next_seq)
+    if use_server_stats:
+        state.aggregates = fetch_server_stats(state.aggregates)
+    state.live = True
+    return True
+
+# Window, aggregates and cursor live in the session, so widget changes re-render them instead of refetching.
+# A new session starts from the CSV snapshot and switches to live data after the first paint.
+state = st.session_state
+if 'log_window' not in state:
+    snapshot = load_snapshot()
+    state.live = False
+    state.use_server_stats = False
+    state.pending_logs = None
+    state.log_window = LogWindow(LOG_WINDOW_SIZE)
+    state.aggregates = LogAggregates(LOG_WINDOW_SIZE)
+    added, _ = state.log_window.extend(snapshot, None)
+    state.aggregates.add(added)
 
 # Title of dashboard
 st.title("FunOlympics Dashboard 🏅")
@@ -58,10 +171,13 @@ with st.sidebar:
             for i in range(0, 101, 20):
                 time.sleep(0.1)
                 progress_bar.progress(i)
-            df = fetch_logs()
+            export_df = fetch_logs()
             progress_bar.progress(100)
 
-        csv = df.to_csv(index = False)
+        # A failed fetch returns an empty frame without columns; export it as an empty CSV
+        if 'Timestamp' in export_df:
+            export_df = export_df.assign(Timestamp=format_timestamps(export_df['Timestamp']))
+        csv = export_df.to_csv(index = False)
         st.download_button(
             label = "Download CSV",
             data = csv,
@@ -71,9 +187,15 @@ with st.sidebar:
 
 # Sidebar filters for main interests
 view_by = st.sidebar.selectbox('View Main Interests By:', ['Sports', 'Country'])
-country_filter = st.sidebar.selectbox('Select Country:', df['Country'].unique())
+country_filter = st.sidebar.selectbox('Select Country:', olympic_countries)
 view_by_time = st.sidebar.selectbox('Select Time Granularity:', ['Day', 'Month'])
-selected_sports = st.sidebar.multiselect('Select Sports:', df['Sport'].unique(), default=df['Sport'].unique()[:5])
+selected_sports = st.sidebar.multiselect('Select Sports:', sports, default=sports[:5])
+data_page = st.sidebar.number_input('Data Table Page:', min_value=1, value=1, step=1)
+history_range = st.sidebar.date_input('Select History Range:', value=(datetime.date(2023, 1, 1), datetime.date(2023, 12, 31)))
+
+# Optional debug panel with the timing spans recorded in this process
+show_metrics = st.sidebar.checkbox('Show Performance Metrics')
+metrics_debug_placeholder = st.sidebar.empty()
 
 # Real-time update placeholders
 data_placeholder = st.empty()
@@ -87,210 +209,195 @@ browser_placeholder = part3.empty()
 trend_placeholder = st.empty()
 sports_placeholder = st.empty()
 heatmap_placeholder = st.empty()
+history_placeholder = st.empty()
 df_placeholder = st.empty()  # Placeholder for DataFrame display
 
-# Real-time update loop
+# plotly is imported only once the page skeleton has been sent
+import figures
+
+# Real-time update loop: render what the session holds, then fetch the next delta
+renderer = PanelRenderer()
+history_drawn = False
 while True:
-    # Fetch data
-    df = sample_logs(fetch_logs())
+    aggregates = state.aggregates
+    df = state.log_window.frame
 
     # Metrics calculations
-    total_visits = len(df)
-    average_response_time = df['Time_Elapsed'].mean()
-    total_countries = df['Country'].nunique()
-
-    # Display metrics in columns
-    with metrics_placeholder.container():
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.markdown(f"""
-                <div style="text-align: center; padding: 20px; border-radius: 10px; background-color: #f0f2f6; margin: 10px; box-shadow: rgba(100, 100, 111, 0.2) 0px 7px 29px 0px;">
-                    <h3 style="color: #6a0dad;"> Number of Visits</h3>
-                    <h1 style="color: #6a0dad;">{total_visits}</h1>
-                </div>
-            """, unsafe_allow_html=True)
-        with col2:
-            st.markdown(f"""
-                <div style="text-align: center; padding: 20px; border-radius: 10px; background-color: #f0f2f6; margin: 10px; box-shadow: rgba(100, 100, 111, 0.2) 0px 7px 29px 0px;">
-                    <h3 style="color: #6a0dad;"> Avg Response Time</h3>
-                    <h1 style="color: #6a0dad;">{average_response_time:.2f} ms</h1>
-                </div>
-            """, unsafe_allow_html=True)
-        with col3:
-            st.markdown(f"""
-                <div style="text-align: center; padding: 20px; border-radius: 10px; background-color: #f0f2f6; margin: 10px; box-shadow: rgba(100, 100, 111, 0.2) 0px 7px 29px 0px;">
-                    <h3 style="color: #6a0dad;"> Countries</h3>
-                    <h1 style="color: #6a0dad;">{total_countries}</h1>
-                </div>
-            """, unsafe_allow_html=True)
-
-
-    with interests_placeholder.container():
-        if view_by == 'Sports':
-            st.subheader('Main Interests Based on Selected/Viewed Sports')
-            sports_interest = df['Sport'].value_counts().reset_index()
-            sports_interest.columns = ['Sport', 'Count']
-            col1, col2 = st.columns([3, 1])
+    summary = aggregates.summary()
+    total_visits = summary['visits']
+    average_response_time = summary['avg_response_time']
+    total_countries = summary['countries']
+    # Sketch estimates; servers without them leave these out
+    unique_ips = summary.get('unique_ips')
+    p95_response_time = summary.get('p95_response_time')
+
+    # Display metrics in columns; every panel below is only redrawn when its inputs changed
+    if renderer.changed('metrics', summary):
+        with span('render.metrics'), metrics_placeholder.container():
+            col1, col2, col3, col4, col5 = st.columns(5)
             with col1:
-                fig = px.bar(sports_interest, x='Sport', y='Count', title='Main Interests Based on Selected/Viewed Sports', labels={'Sport': 'Sport', 'Count': 'Number of Views'})
-                st.plotly_chart(fig)
+                st.markdown(f"""
+                    <div style="text-align: center; padding: 20px; border-radius: 10px; background-color: #f0f2f6; margin: 10px; box-shadow: rgba(100, 100, 111, 0.2) 0px 7px 29px 0px;">
+                        <h3 style="color: #6a0dad;"> Number of Visits</h3>
+                        <h1 style="color: #6a0dad;">{total_visits}</h1>
+                    </div>
+                """, unsafe_allow_html=True)
             with col2:
-                st.write(sports_interest)
-        else:
-            st.subheader('Main viewed Sports Based on Country')
-            country_data = df[df['Country'] == country_filter]
-            country_sports_interest = country_data['Sport'].value_counts().reset_index()
-            country_sports_interest.columns = ['Sport', 'Count']
+                st.markdown(f"""
+                    <div style="text-align: center; padding: 20px; border-radius: 10px; background-color: #f0f2f6; margin: 10px; box-shadow: rgba(100, 100, 111, 0.2) 0px 7px 29px 0px;">
+                        <h3 style="color: #6a0dad;"> Avg Response Time</h3>
+                        <h1 style="color: #6a0dad;">{average_response_time:.2f} ms</h1>
+                    </div>
+                """, unsafe_allow_html=True)
+            with col3:
+                st.markdown(f"""
+                    <div style="text-align: center; padding: 20px; border-radius: 10px; background-color: #f0f2f6; margin: 10px; box-shadow: rgba(100, 100, 111, 0.2) 0px 7px 29px 0px;">
+                        <h3 style="color: #6a0dad;"> Countries</h3>
+                        <h1 style="color: #6a0dad;">{total_countries}</h1>
+                    </div>
+                """, unsafe_allow_html=True)
+            with col4:
+                st.markdown(f"""
+                    <div style="text-align: center; padding: 20px; border-radius: 10px; background-color: #f0f2f6; margin: 10px; box-shadow: rgba(100, 100, 111, 0.2) 0px 7px 29px 0px;">
+                        <h3 style="color: #6a0dad;"> Unique IPs (est.)</h3>
+                        <h1 style="color: #6a0dad;">{unique_ips if unique_ips is not None else '-'}</h1>
+                    </div>
+                """, unsafe_allow_html=True)
+            with col5:
+                p95_text = f'{p95_response_time:.0f} ms' if p95_response_time is not None else '-'
+                percentiles = f"p50 {summary['p50_response_time']:.0f} / p99 {summary['p99_response_time']:.0f} ms" if p95_response_time is not None else ''
+                st.markdown(f"""
+                    <div style="text-align: center; padding: 20px; border-radius: 10px; background-color: #f0f2f6; margin: 10px; box-shadow: rgba(100, 100, 111, 0.2) 0px 7px 29px 0px;">
+                        <h3 style="color: #6a0dad;"> p95 Response Time</h3>
+                        <h1 style="color: #6a0dad;">{p95_text}</h1>
+                        <p style="color: #6a0dad;">{percentiles}</p>
+                    </div>
+                """, unsafe_allow_html=True)
+
+    if view_by == 'Sports':
+        subheader = 'Main Interests Based on Selected/Viewed Sports'
+        interest_title = 'Main Interests Based on Selected/Viewed Sports'
+        sports_interest = aggregates.counts('Sport').reset_index()
+    else:
+        subheader = 'Main viewed Sports Based on Country'
+        interest_title = f'Views per Sport in {country_filter}'
+        sports_interest = aggregates.sport_counts_for(country_filter).reset_index()
+    sports_interest.columns = ['Sport', 'Count']
+    if renderer.changed('interests', interest_title, sports_interest):
+        with span('render.interests'), interests_placeholder.container():
+            st.subheader(subheader)
             col1, col2 = st.columns([3, 1])
             with col1:
-                fig = px.bar(country_sports_interest, x='Sport', y='Count', title=f'Views per Sport in {country_filter}', labels={'Sport': 'Sport', 'Count': 'Number of Views'})
-                st.plotly_chart(fig)
+                fig = renderer.figure(('interests', interest_title), sports_interest,
+                                      lambda data: figures.interests_bar(data, interest_title), figures.update_interests_bar)
+                st.plotly_chart(fig, key=renderer.key('interests'))
             with col2:
-                st.write(country_sports_interest)
+                st.write(sports_interest)
 
     # Geographic Distribution of Views
-    with geo_placeholder.container():
-        #st.subheader('Geographic Distribution of Views')
-        country_views = df['Country'].value_counts().reset_index()
-        country_views.columns = ['Country', 'Views']
-        fig_geo = px.choropleth(
-            country_views,
-            locations="Country",
-            locationmode='country names',
-            color="Views",
-            hover_name="Country",
-            color_continuous_scale=px.colors.sequential.Viridis,
-            title="Geographic Distribution of Views"
-        )
-        fig_geo.update_layout(
-            geo=dict(
-                showframe=False,
-                showcoastlines=False,
-                projection_type='equirectangular'
-            ),
-            title=dict(
-                x=0.5,
-                xanchor='center'
-            )
-        )
-        st.plotly_chart(fig_geo, use_container_width=True)
-
-    # Regular expressions to match different devices
-    windows_pattern = re.compile(r'Windows|Win')
-    mac_pattern = re.compile(r'Macintosh|Mac OS')
-    iphone_pattern = re.compile(r'iPhone')
-    ipad_pattern = re.compile(r'iPad')
-    android_pattern = re.compile(r'Android')
-
-    # Regular expressions to match different browsers
-    firefox_pattern = re.compile(r'Firefox')
-    chrome_pattern = re.compile(r'Chrome')
-    safari_pattern = re.compile(r'Safari')
-    edge_pattern = re.compile(r'Edg')
-
-    # Function to extract device type from user agent
-    def extract_device(user_agent):
-        if re.search(windows_pattern, user_agent):
-            return 'Windows'
-        elif re.search(mac_pattern, user_agent):
-            return 'Mac'
-        elif re.search(iphone_pattern, user_agent):
-            return 'iPhone'
-        elif re.search(ipad_pattern, user_agent):
-            return 'iPad'
-        elif re.search(android_pattern, user_agent):
-            return 'Android'
-        else:
-            return 'Other'
-
-    # Function to extract browser type from user agent
-    def extract_browser(user_agent):
-        if re.search(firefox_pattern, user_agent):
-            return 'Firefox'
-        elif re.search(chrome_pattern, user_agent):
-            return 'Chrome'
-        elif re.search(safari_pattern, user_agent):
-            return 'Safari'
-        elif re.search(edge_pattern, user_agent):
-            return 'Edge'
-        else:
-            return 'Other'
+    country_views = aggregates.counts('Country').reset_index()
+    country_views.columns = ['Country', 'Views']
+    if renderer.changed('geo', country_views):
+        with span('render.geo'), geo_placeholder.container():
+            #st.subheader('Geographic Distribution of Views')
+            fig_geo = renderer.figure('geo', country_views, figures.geo_map, figures.update_geo_map)
+            st.plotly_chart(fig_geo, use_container_width=True, key=renderer.key('geo'))
 
     # Device and Browser Distribution
-    df['Device'] = df['User_Agent'].apply(lambda x: extract_device(x))
-    df['Browser'] = df['User_Agent'].apply(lambda x: extract_browser(x))
-    device_distribution = df['Device'].value_counts()
-    browser_distribution = df['Browser'].value_counts()
-    status_code_distribution = df['Status_Code'].value_counts()
-
-    with device_placeholder.container():
-        fig_device = px.pie(device_distribution, values=device_distribution.values, names=device_distribution.index, hole=0.5, 
-                            title='Distribution of Traffic by Device Type', color_discrete_sequence=px.colors.qualitative.Set3)
-        fig_device.update_traces(textinfo='percent+label', pull=[0.1]*len(device_distribution), textposition='inside')
-        fig_device.update_layout(showlegend=False)
-        st.plotly_chart(fig_device, use_container_width=True)
-
-    with status_placeholder.container():
-        fig_status = px.pie(status_code_distribution, values=status_code_distribution.values, names=status_code_distribution.index, hole=0.5, 
-                            title='Distribution of Traffic by Status Code', color_discrete_sequence=px.colors.qualitative.Pastel1)
-        fig_status.update_traces(textinfo='percent')
-        fig_status.update_layout(legend=dict(orientation="v", yanchor="top", y=1, xanchor="left", x=1.1))
-        st.plotly_chart(fig_status, use_container_width=True)
-
-    with browser_placeholder.container():
-        fig_browser = px.pie(browser_distribution, values=browser_distribution.values, names=browser_distribution.index, 
-                             title='Distribution of Browsers', hole=0.5, color_discrete_sequence=px.colors.qualitative.Set2)
-        fig_browser.update_traces(textinfo='percent', pull=[0.1]*len(browser_distribution), textposition='inside')
-        fig_browser.update_layout(showlegend=True)
-        st.plotly_chart(fig_browser, use_container_width=True)
+    device_distribution = aggregates.counts('Device')
+    browser_distribution = aggregates.counts('Browser')
+    status_code_distribution = aggregates.counts('Status_Code')
+
+    if renderer.changed('device', device_distribution):
+        with span('render.device'), device_placeholder.container():
+            fig_device = renderer.figure('device', device_distribution, figures.device_pie, figures.update_pie)
+            st.plotly_chart(fig_device, use_container_width=True, key=renderer.key('device'))
+
+    if renderer.changed('status', status_code_distribution):
+        with span('render.status'), status_placeholder.container():
+            fig_status = renderer.figure('status', status_code_distribution, figures.status_pie, figures.update_pie)
+            st.plotly_chart(fig_status, use_container_width=True, key=renderer.key('status'))
+
+    if renderer.changed('browser', browser_distribution):
+        with span('render.browser'), browser_placeholder.container():
+            fig_browser = renderer.figure('browser', browser_distribution, figures.browser_pie, figures.update_pie)
+            st.plotly_chart(fig_browser, use_container_width=True, key=renderer.key('browser'))
 
     # Trend of Views Over Time
-    df['Timestamp'] = pd.to_datetime(df['Timestamp'], format='%d/%m/%Y:%H:%M:%S')
-    df['Month'] = df['Timestamp'].dt.month_name()
-    df['Day'] = df['Timestamp'].dt.day
-    df['Year'] = df['Timestamp'].dt.year
-
-    with trend_placeholder.container():
-        st.subheader('Trend of Views Over Time')
-        if view_by_time == 'Day':
-            time_data = df.groupby(['Day', 'Month', 'Year']).size().reset_index(name='Views')
-            time_data['Date'] = pd.to_datetime(time_data['Day'].astype(str) + '-' + time_data['Month'] + '-' + time_data['Year'].astype(str), format='%d-%B-%Y')
-            time_data = time_data.sort_values('Date')
-            fig = px.line(time_data, x='Date', y='Views', title='Trend of Views Over Time', labels={'Date': 'Date', 'Views': 'Number of Views'})
-        else:
-            time_data = df.groupby(['Month', 'Year']).size().reset_index(name='Views')
-            time_data['Month'] = pd.Categorical(time_data['Month'], categories=[
-                'January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 'September', 'October', 'November', 'December'], ordered=True)
-            time_data = time_data.sort_values(['Year', 'Month'])
-            fig = px.line(time_data, x='Month', y='Views', title='Trend of Views Over Time', labels={'Month': 'Month', 'Views': 'Number of Views'})
-        st.plotly_chart(fig, use_container_width=True)
+    if view_by_time == 'Day':
+        time_data, time_axis = aggregates.daily_views(), 'Date'
+    else:
+        time_data, time_axis = aggregates.monthly_views(), 'Month'
+    if renderer.changed('trend', time_axis, time_data):
+        with span('render.trend'), trend_placeholder.container():
+            st.subheader('Trend of Views Over Time')
+            fig = renderer.figure(('trend', time_axis), time_data, lambda data: figures.trend_line(data, time_axis),
+                                  lambda fig, data: figures.update_trend_line(fig, data, time_axis))
+            st.plotly_chart(fig, use_container_width=True, key=renderer.key('trend'))
 
     # Sports Popularity Over Time
-    with sports_placeholder.container():
-        sports_data = df[df['Sport'].isin(selected_sports)]
-        sports_data['Date'] = sports_data['Timestamp'].dt.to_period('M').astype(str)
-        sports_trends = sports_data.groupby(['Date', 'Sport']).size().reset_index(name='Views')
-        fig = px.line(sports_trends, x='Date', y='Views', color='Sport', title='Sports Popularity Over Time', labels={'Date': 'Date', 'Views': 'Number of Views'})
-        st.plotly_chart(fig, use_container_width=True)
+    sports_trends = aggregates.sport_trend(selected_sports)
+    if renderer.changed('sports', sports_trends):
+        with span('render.sports'), sports_placeholder.container():
+            fig = renderer.figure('sports', sports_trends, figures.sports_trend_lines)
+            st.plotly_chart(fig, use_container_width=True, key=renderer.key('sports'))
 
     # Peak Viewership Hours
-    df['Hour'] = df['Timestamp'].dt.hour
-    df['DayOfWeek'] = df['Timestamp'].dt.day_name()
-
-    with heatmap_placeholder.container():
-        #st.subheader('Peak Viewership Hours')
-        heatmap_data = df.groupby(['Hour', 'DayOfWeek']).size().reset_index(name='Views')
-        heatmap_data['DayOfWeek'] = pd.Categorical(heatmap_data['DayOfWeek'], categories=[
-            'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'], ordered=True)
-        heatmap_data = heatmap_data.pivot(index='Hour', columns='DayOfWeek', values='Views')
-        fig = px.imshow(heatmap_data, aspect="auto", title='Peak Viewership Hours', labels={'x': 'Day of Week', 'y': 'Hour of Day', 'color': 'Number of Views'})
-        fig.update_layout(xaxis_title='Day of Week', yaxis_title='Hour of Day')
-        st.plotly_chart(fig, use_container_width=True)
-    
-    # Display the DataFrame
-    with df_placeholder.container():
-        st.subheader('Data')
-        st.write(df)
-
-    # Sleep for a certain period before refreshing
-    time.sleep(3)  # Refresh every 3 seconds
\ No newline at end of file
+    heatmap_data = aggregates.heatmap()
+    if renderer.changed('heatmap', heatmap_data):
+        with span('render.heatmap'), heatmap_placeholder.container():
+            #st.subheader('Peak Viewership Hours')
+            fig = renderer.figure('heatmap', heatmap_data, figures.heatmap, figures.update_heatmap)
+            st.plotly_chart(fig, use_container_width=True, key=renderer.key('heatmap'))
+
+    # Display one page of the DataFrame, newest rows first, instead of sending the whole window
+    page_count = max(1, -(-len(df) // DATA_PAGE_SIZE))
+    page = min(data_page, page_count)
+    page_df = df.iloc[::-1].iloc[(page - 1) * DATA_PAGE_SIZE:page * DATA_PAGE_SIZE]
+    if renderer.changed('data', page, page_count, page_df):
+        with span('render.data'), df_placeholder.container():
+            st.subheader('Data')
+            st.caption(f"Page {page} of {page_count} ({len(df)} rows in the window)")
+            st.dataframe(page_df, use_container_width=True)
+
+    # Timing of the instrumented stages so far, in milliseconds
+    if show_metrics:
+        with metrics_debug_placeholder.container():
+            st.caption('Performance (ms)')
+            st.dataframe(pd.DataFrame.from_dict(REGISTRY.span_summary(), orient='index').round(2), use_container_width=True)
+
+    # The first pass of a new session painted the snapshot; switch to the live window now
+    if not state.live:
+        if not go_live():
+            time.sleep(REFRESH_INTERVAL)
+        continue
+
+    # Archived history beyond the live window, drawn once per run after the live panels are on screen
+    if not history_drawn:
+        history_drawn = True
+        with span('render.history'), history_placeholder.container():
+            if len(history_range) == 2:
+                import requests
+                try:
+                    history_data = load_daily_history(*history_range)
+                except requests.RequestException:
+                    history_data = None
+                if history_data is None or history_data.empty:
+                    st.info("No archived history is available for the selected range.")
+                else:
+                    st.plotly_chart(figures.history_line(history_data), use_container_width=True)
+
+    # Fetch only the rows added since the last refresh and roll the window forward.
+    # Without prefetching, sleep for a certain period first; a pending prefetch already waits.
+    if state.pending_logs is None:
+        time.sleep(REFRESH_INTERVAL)  # Refresh every 3 seconds
+        apply_log_delta(*fetch_log_delta(state.log_window.cursor, poll_size()))
+    else:
+        pending_logs, state.pending_logs = state.pending_logs, None
+        apply_log_delta(*wait_for_log_delta(pending_logs, state.log_window.cursor))
+    if state.use_server_stats:
+        state.aggregates = fetch_server_stats(state.aggregates)
+
+    # Start downloading the next batch so it arrives while this one renders
+    if PREFETCH_LOGS:
+        state.pending_logs = get_log_client().prefetch_log_delta(state.log_window.cursor, poll_size(), state.log_window.size, delay=REFRESH_INTERVAL)
\ No newline at end of file
@@ -0,0 +1,275 @@
+"""
+Lightweight in-process metrics: timing spans, histograms, counters and gauges.
+
+Observations are a perf_counter() call, a bisect and a locked increment, so
+instrumentation can stay on in production. The log server exposes the
+registry in Prometheus text format on /metrics, and the dashboard can show it
+in a sidebar debug panel. Set FUNOLYMPICS_METRICS=0 to turn spans into no-ops.
+
+Each process has its own registry; under gunicorn every worker reports its
+own series, as Prometheus expects from separately scraped instances.
+"""
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+METRICS_ENABLED = os.environ.get('FUNOLYMPICS_METRICS', '1') != '0'
+
+# Upper bounds, in seconds, for latency histograms
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Upper bounds for row and byte count histograms
+SIZE_BUCKETS = tuple(10 ** exponent for exponent in range(1, 9))
+
+
+def _label_text(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in labels) + '}'
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram with one series per label combination.
+
+    Parameters:
+    name (str): Metric name.
+    help (str): One-line description.
+    buckets (tuple): Increasing upper bounds; +Inf is implied.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, help, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def quantile(self, q, **labels):
+        """
+        Estimates the q-quantile of a series by interpolating inside its buckets.
+        """
+        with self._lock:
+            series = self._series.get(tuple(sorted(labels.items())))
+            if series is None or series[2] == 0:
+                return None
+            counts, total = list(series[0]), series[2]
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else lower
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def snapshot(self):
+        """
+        Returns {labels: {'count', 'sum', 'mean', 'p50', 'p95'}} for every series.
+        """
+        with self._lock:
+            keys = {key: (series[1], series[2]) for key, series in self._series.items()}
+        return {
+            key: {'count': count, 'sum': total, 'mean': total / count if count else None,
+                  'p50': self.quantile(0.5, **dict(key)), 'p95': self.quantile(0.95, **dict(key))}
+            for key, (total, count) in keys.items()
+        }
+
+    def samples(self):
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for key, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                yield f'{self.name}_bucket{_label_text(key + (("le", le),))} {cumulative}'
+            yield f'{self.name}_sum{_label_text(key)} {total!r}'
+            yield f'{self.name}_count{_label_text(key)} {count}'
+
+
+class Counter:
+    """
+    Monotonic counter with one series per label combination.
+    """
+
+    kind = 'counter'
+
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            series = dict(self._series)
+        for key, value in sorted(series.items()):
+            yield f'{self.name}{_label_text(key)} {value}'
+
+
+class Gauge:
+    """
+    Value read from a callback at scrape time, e.g. the log store's size.
+    """
+
+    kind = 'gauge'
+
+    def __init__(self, name, help, read):
+        self.name = name
+        self.help = help
+        self.read = read
+
+    def samples(self):
+        yield f'{self.name} {self.read()}'
+
+
+class CallbackCounter(Gauge):
+    """
+    Monotonic total read from a callback at scrape time, e.g. rows appended to the log store.
+    """
+
+    kind = 'counter'
+
+
+class MetricsRegistry:
+    """
+    Holds the metrics of one process and renders them for /metrics.
+    """
+
+    def __init__(self, enabled=METRICS_ENABLED):
+        self.enabled = enabled
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self.spans = self.histogram('funolympics_span_seconds', 'Time spent in instrumented code paths.')
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def histogram(self, name, help, buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, help, buckets))
+
+    def counter(self, name, help):
+        return self._register(Counter(name, help))
+
+    def gauge(self, name, help, read):
+        """
+        Registers (or replaces) a gauge read from `read()` at scrape time.
+        """
+        return self._replace(Gauge(name, help, read))
+
+    def callback_counter(self, name, help, read):
+        """
+        Registers (or replaces) a counter whose running total is read from `read()` at scrape time.
+        """
+        return self._replace(CallbackCounter(name, help, read))
+
+    def _replace(self, metric):
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    @contextmanager
+    def span(self, name):
+        """
+        Times the enclosed block into funolympics_span_seconds{span=name}.
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.observe(time.perf_counter() - start, span=name)
+
+    def timed(self, name):
+        """
+        Decorator form of span().
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def timed_chunks(self, chunks, name, on_complete=None):
+        """
+        Wraps a streamed response body so the time spent producing its chunks is recorded
+        under span `name` once the stream ends; on_complete(total_bytes) is called then too.
+        """
+        elapsed, total_bytes = 0.0, 0
+        iterator = iter(chunks)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    elapsed += time.perf_counter() - start
+                total_bytes += len(chunk)
+                yield chunk
+        finally:
+            if self.enabled:
+                self.spans.observe(elapsed, span=name)
+                if on_complete is not None:
+                    on_complete(total_bytes)
+
+    def span_summary(self):
+        """
+        Returns {span name: {'count', 'mean', 'p50', 'p95'}} with times in milliseconds.
+        """
+        summary = {}
+        for key, series in sorted(self.spans.snapshot().items()):
+            summary[dict(key)['span']] = {
+                'count': series['count'],
+                'mean_ms': series['mean'] * 1000 if series['mean'] is not None else None,
+                'p50_ms': series['p50'] * 1000 if series['p50'] is not None else None,
+                'p95_ms': series['p95'] * 1000 if series['p95'] is not None else None,
+            }
+        return summary
+
+    def render_prometheus(self):
+        """
+        Renders every metric in the Prometheus text exposition format.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide registry used by the server and the dashboard
+REGISTRY = MetricsRegistry()
+span = REGISTRY.span
+timed = REGISTRY.timed
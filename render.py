@@ -0,0 +1,75 @@
+import hashlib
+
+import pandas as pd
+
+
+def fingerprint(*values):
+    """
+    Hashes a panel's inputs (aggregates, widget values) into a short digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for value in values:
+        if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+            digest.update(repr((type(value).__name__, value.shape, list(getattr(value, 'columns', [])))).encode())
+            digest.update(pd.util.hash_pandas_object(value, index=not isinstance(value, pd.Index)).values.tobytes())
+        else:
+            digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+
+class PanelRenderer:
+    """
+    Render-diffing for dashboard panels.
+
+    changed() tells the loop whether a panel's inputs differ from the last time
+    it was drawn, so unchanged placeholders are left alone instead of being
+    rebuilt and re-sent to the browser. figure() reuses the panel's previous
+    figure and only swaps in new trace data when an update function is given.
+
+    A sliding window can bring a panel back to inputs it had a few draws ago,
+    which produces an identical chart; Streamlit rejects two identical charts in
+    one script run unless they have different keys, so every draw gets its own
+    key from key().
+    """
+
+    def __init__(self):
+        self._fingerprints = {}
+        self._figures = {}
+        self._draws = {}
+
+    def changed(self, panel, *inputs):
+        current = fingerprint(*inputs)
+        if self._fingerprints.get(panel) == current:
+            return False
+        self._fingerprints[panel] = current
+        self._draws[panel] = self._draws.get(panel, 0) + 1
+        return True
+
+    def key(self, panel):
+        """
+        Element key for the panel's current draw, unique within the script run.
+        """
+        return f"{panel}-{self._draws.get(panel, 0)}"
+
+    def figure(self, key, data, build, update=None):
+        """
+        Returns the figure for `key`, updated in place with `data` when possible.
+
+        Parameters:
+        key (hashable): Identifies the figure; a different key always builds a new one.
+        data: The panel's aggregate.
+        build (callable): build(data) -> new figure.
+        update (callable): update(figure, data) -> None; when omitted the figure is rebuilt.
+        """
+        fig = self._figures.get(key)
+        if fig is None or update is None:
+            fig = build(data)
+        else:
+            update(fig, data)
+        self._figures[key] = fig
+        return fig
+
+    def reset(self):
+        # Draw counts are kept, so keys stay unique after a reset
+        self._fingerprints.clear()
+        self._figures.clear()
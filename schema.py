@@ -0,0 +1,117 @@
+"""
+Shared schema for log frames on both the server and the dashboard.
+
+The string-like columns have small, fixed vocabularies, so they are stored as
+categoricals with fixed categories: every frame built from this schema shares
+the same codes, which keeps memory low and makes groupbys and isin filters
+work on small integers instead of Python strings.
+"""
+import pandas as pd
+
+from ua_classifier import BROWSERS, DEVICES
+
+# List of countries participating in the FunOlympics
+olympic_countries = [
+    "Algeria", "Angola", "Argentina", "Australia", "Bahrain", "Bangladesh",
+    "Barbados", "Belarus", "Belgium", "Benin", "Bolivia", "Botswana", "Brazil", "Bulgaria",
+    "Burkina Faso", "Burundi", "Cameroon", "Canada", "China", "Colombia", "Comoros",
+    "Czech Republic", "North Korea", "Democratic Republic of the Congo", "Denmark",
+    "Egypt", "Eswatini", "Ethiopia", "Finland", "France", "Gabon", "Germany", "Ghana",
+    "Greece", "Guinea", "Honduras", "Hungary", "India", "Iran", "Iraq",
+    "Ireland", "Israel", "Italy", "Ivory Coast", "Jamaica", "Japan", "Kenya", "Lesotho", "Liberia",
+    "Madagascar", "Malawi", "Mali", "Mauritius", "Mexico", "Morocco", "Mozambique", "Namibia", "Netherlands",
+    "New Zealand", "Nigeria", "Norway", "Pakistan", "Palestine", "Paraguay", "Philippines", "Poland", "Portugal",
+    "Russia", "Rwanda", "Saudi Arabia", "Senegal", "Serbia", "Seychelles", "Sierra Leone", "Singapore", "Slovakia",
+    "Slovenia", "Somalia", "South Africa", "South Korea", "South Sudan", "Spain", "Sri Lanka", "Sudan", "Sweden", "Switzerland", "Syria",
+    "Tanzania", "Thailand", "Trinidad and Tobago", "Tunisia", "Turkey",
+    "Uganda", "Ukraine", "United Kingdom", "United States", "Uruguay", "Venezuela", "Zambia", "Zimbabwe"
+]
+
+# Sports pages available on the streaming platform
+sports = [
+    "Archery",
+    "Athletics (Track and Field)",
+    "Badminton",
+    "Basketball",
+    "Boxing",
+    "Canoeing",
+    "Cycling",
+    "Fencing",
+    "Football",
+    "Golf",
+    "Gymnastics",
+    "Handball",
+    "Hockey",
+    "Judo",
+    "Rowing",
+    "Rugby",
+    "Sailing",
+    "Shooting",
+    "Skateboarding",
+    "Sport Climbing",
+    "Surfing",
+    "Table Tennis",
+    "Taekwondo",
+    "Tennis",
+    "Triathlon",
+    "Volleyball",
+    "Weightlifting",
+    "Wrestling"
+]
+
+# Sample user agents provided
+sample_user_agents = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:84.0) Gecko/20100101 Firefox/84.0",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/87.0.4280.88 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Safari/605.1.15",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 14_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0.3 Mobile/15E148 Safari/604.1",
+    "Mozilla/5.0 (iPad; CPU OS 14_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0.3 Mobile/15E148 Safari/604.1",
+    "Mozilla/5.0 (Linux; Android 10; HD1913) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/87.0.4280.101 Mobile Safari/537.36",
+    "Mozilla/5.0 (Linux; Android 10; LM-Q720) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/87.0.4280.146 Mobile Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/87.0.4280.88 Safari/537.36 OPR/73.0.3812.123",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/87.0.4280.146 Safari/537.36 Edg/87.0.664.75",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 14_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) FxiOS/1.14 Mobile/15E148 Safari/605.1.15",
+    "Mozilla/5.0 (iPad; CPU OS 14_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) FxiOS/1.14 Mobile/15E148 Safari/605.1.15"
+]
+
+# HTTP status codes the server emits
+status_codes = [200, 404, 500]
+
+COUNTRY_DTYPE = pd.CategoricalDtype(olympic_countries)
+SPORT_DTYPE = pd.CategoricalDtype(sports)
+USER_AGENT_DTYPE = pd.CategoricalDtype(sample_user_agents)
+STATUS_CODE_DTYPE = pd.CategoricalDtype(status_codes)
+DEVICE_DTYPE = pd.CategoricalDtype(DEVICES)
+BROWSER_DTYPE = pd.CategoricalDtype(BROWSERS)
+
+# Column name -> categorical dtype
+CATEGORICAL_DTYPES = {
+    'Country': COUNTRY_DTYPE,
+    'Sport': SPORT_DTYPE,
+    'User_Agent': USER_AGENT_DTYPE,
+    'Status_Code': STATUS_CODE_DTYPE,
+    'Device': DEVICE_DTYPE,
+    'Browser': BROWSER_DTYPE,
+}
+
+
+def apply_schema(logs_df):
+    """
+    Converts the categorical columns present in logs_df to their schema dtypes, in place.
+
+    Values outside a column's vocabulary become missing.
+
+    Returns:
+    pd.DataFrame: The same frame, for chaining.
+    """
+    for name, dtype in CATEGORICAL_DTYPES.items():
+        if name in logs_df.columns and logs_df[name].dtype != dtype:
+            logs_df[name] = logs_df[name].astype(dtype)
+    return logs_df
+
+
+def from_codes(codes, dtype):
+    """
+    Builds a categorical column from integer codes into the dtype's categories.
+    """
+    return pd.Categorical.from_codes(codes, dtype=dtype)
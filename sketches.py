@@ -0,0 +1,364 @@
+"""
+Constant-memory sketches for high-volume log windows.
+
+- HyperLogLog estimates distinct counts (unique IPs, countries).
+- SpaceSaving keeps approximate top-K counts (sports, countries).
+- TDigest estimates quantiles (Time_Elapsed p50/p95/p99).
+
+Every sketch takes whole arrays per update, can be merged with another sketch
+of the same kind (time buckets, server workers), and round-trips through
+to_dict()/from_dict() so it can be sent as JSON. Sketches that are merged must
+be fed the same value representation: the log server counts IP codes, while
+the dashboard counts dotted IP strings.
+"""
+import base64
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from schema import COUNTRY_DTYPE, SPORT_DTYPE
+
+_UINT64_MAX = np.uint64(2**64 - 1)
+
+
+def _hash64(values):
+    """
+    Hashes an array of numbers or strings to uint64, consistently across processes.
+    Categoricals hash each category once and look the hashes up by code.
+    """
+    if isinstance(values, pd.Series):
+        values = values.array
+    if isinstance(values, pd.Categorical):
+        return _hash64(np.asarray(values.categories))[values.codes[values.codes >= 0]]
+    values = np.asarray(values)
+    if values.dtype.kind in 'iub':
+        return pd.util.hash_array(values.astype(np.int64))
+    return pd.util.hash_array(values.astype(object))
+
+
+def _leading_zeros(x):
+    """
+    Counts leading zero bits of each uint64 in x (64 for zero).
+    """
+    x = x.copy()
+    zeros = np.zeros(x.shape, dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        mask = x <= (_UINT64_MAX >> np.uint64(shift))
+        zeros[mask] += shift
+        x[mask] <<= np.uint64(shift)
+    zeros += (x >> np.uint64(63)) == 0
+    return zeros
+
+
+class HyperLogLog:
+    """
+    Distinct-count estimator using 2**precision one-byte registers (4 KB at the default
+    precision of 12, about 1.6% standard error).
+    """
+
+    def __init__(self, precision=12):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, values):
+        if len(values) == 0:
+            return
+        hashes = _hash64(values)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        rest = hashes << np.uint64(self.precision)
+        ranks = np.minimum(_leading_zeros(rest) + 1, 64 - self.precision + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, ranks)
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("cannot merge HyperLogLogs with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        empty = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and empty:
+            # Linear counting is more accurate while many registers are still empty
+            estimate = m * np.log(m / empty)
+        return int(round(estimate))
+
+    def to_dict(self):
+        return {'precision': self.precision, 'registers': base64.b64encode(self.registers.tobytes()).decode('ascii')}
+
+    @classmethod
+    def from_dict(cls, state):
+        sketch = cls(state['precision'])
+        sketch.registers = np.frombuffer(base64.b64decode(state['registers']), dtype=np.uint8).copy()
+        return sketch
+
+
+class SpaceSaving:
+    """
+    Approximate top-K counter that tracks at most `capacity` items. A reported count
+    overestimates the true count by at most its error.
+
+    Counts are exact while there are no more distinct items than `capacity`; beyond
+    that, items close to uniformly distributed keep evicting each other and the
+    counts become noise, so size it above the vocabulary when that is known.
+    """
+
+    def __init__(self, capacity=64):
+        self.capacity = int(capacity)
+        self.counts = {}
+        self.errors = {}
+
+    def update(self, values):
+        # Most frequent first, so a batch's rare items cannot evict its heavy hitters
+        batch = pd.Series(values).value_counts()
+        for item, count in zip(batch.index, batch.to_numpy()):
+            self._add(item, int(count))
+
+    def _add(self, item, count, error=0):
+        if count <= 0:
+            return
+        if item in self.counts:
+            self.counts[item] += count
+            self.errors[item] += error
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = error
+        else:
+            # Replace the smallest item; its count becomes the newcomer's error bound
+            smallest = min(self.counts, key=self.counts.get)
+            floor = self.counts.pop(smallest)
+            self.errors.pop(smallest)
+            self.counts[item] = floor + count
+            self.errors[item] = floor + error
+
+    def merge(self, other):
+        for item, count in other.counts.items():
+            self._add(item, count, other.errors[item])
+        return self
+
+    def top(self, n=10):
+        """
+        Returns up to n (item, count, error) tuples, largest count first.
+        """
+        ranked = sorted(self.counts.items(), key=lambda pair: pair[1], reverse=True)[:n]
+        return [(item, count, self.errors[item]) for item, count in ranked]
+
+    def to_dict(self):
+        return {'capacity': self.capacity, 'items': [[str(item), count, self.errors[item]] for item, count in self.counts.items()]}
+
+    @classmethod
+    def from_dict(cls, state):
+        sketch = cls(state['capacity'])
+        for item, count, error in state['items']:
+            sketch.counts[item] = count
+            sketch.errors[item] = error
+        return sketch
+
+
+class TDigest:
+    """
+    Quantile estimator that keeps weighted centroids, small near the tails and larger
+    near the median, so extreme percentiles stay accurate. At most about `compression`
+    centroids are kept, however many values are added.
+    """
+
+    def __init__(self, compression=100):
+        self.compression = float(compression)
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def total(self):
+        return float(self.weights.sum())
+
+    def update(self, values, weights=None):
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        if weights is None:
+            # Repeated values (e.g. integer milliseconds) collapse into one weighted point
+            values, weights = np.unique(values, return_counts=True)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._compress(np.concatenate([self.means, values]), np.concatenate([self.weights, np.asarray(weights, dtype=np.float64)]))
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        # Arcsine scale function: a centroid may span one unit of k, which keeps centroids
+        # small near q=0 and q=1 and bounds their number by the compression
+        scale = self.compression / (2 * math.pi)
+        merged_means, merged_weights = [], []
+        mean, weight, before = means[0], weights[0], 0.0
+        k_start = scale * math.asin(-1.0)
+        for next_mean, next_weight in zip(means[1:], weights[1:]):
+            q_end = min(1.0, (before + weight + next_weight) / total)
+            if scale * math.asin(2 * q_end - 1) - k_start <= 1:
+                weight += next_weight
+                mean += (next_mean - mean) * next_weight / weight
+            else:
+                merged_means.append(mean)
+                merged_weights.append(weight)
+                before += weight
+                k_start = scale * math.asin(min(1.0, 2 * before / total - 1))
+                mean, weight = next_mean, next_weight
+        merged_means.append(mean)
+        merged_weights.append(weight)
+        self.means, self.weights = np.array(merged_means), np.array(merged_weights)
+
+    def merge(self, other):
+        if len(other.weights):
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+        return self
+
+    def quantile(self, q):
+        """
+        Estimates the q-quantile (0 <= q <= 1), or None when empty.
+        """
+        if not len(self.weights):
+            return None
+        # Interpolate between centroid midpoints, anchored at the observed min and max
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], centers, [self.total]])
+        means = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(q * self.total, positions, means))
+
+    def to_dict(self):
+        return {'compression': self.compression, 'means': self.means.tolist(), 'weights': self.weights.tolist(),
+                'min': self.min if len(self.weights) else None, 'max': self.max if len(self.weights) else None}
+
+    @classmethod
+    def from_dict(cls, state):
+        sketch = cls(state['compression'])
+        sketch.means = np.asarray(state['means'], dtype=np.float64)
+        sketch.weights = np.asarray(state['weights'], dtype=np.float64)
+        if len(sketch.weights):
+            sketch.min, sketch.max = state['min'], state['max']
+        return sketch
+
+
+class LogSketches:
+    """
+    The sketches kept per log window: distinct IPs and countries, top sports and
+    countries, and the Time_Elapsed distribution. The top-K counters hold the whole
+    sport and country vocabulary, so their counts are exact.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.ips = HyperLogLog()
+        self.countries = HyperLogLog()
+        self.top_sports = SpaceSaving(max(64, len(SPORT_DTYPE.categories)))
+        self.top_countries = SpaceSaving(max(64, len(COUNTRY_DTYPE.categories)))
+        self.time_elapsed = TDigest()
+
+    def update(self, ips, countries, sports, time_elapsed):
+        """
+        Adds a batch of rows, given as equal-length arrays; countries and sports may be categoricals.
+        """
+        self.rows += len(ips)
+        self.ips.update(ips)
+        self.countries.update(countries)
+        self.top_sports.update(sports)
+        self.top_countries.update(countries)
+        self.time_elapsed.update(time_elapsed)
+
+    def add_frame(self, logs_df):
+        if not logs_df.empty:
+            self.update(logs_df['IP'].to_numpy(), logs_df['Country'], logs_df['Sport'], logs_df['Time_Elapsed'].to_numpy())
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.ips.merge(other.ips)
+        self.countries.merge(other.countries)
+        self.top_sports.merge(other.top_sports)
+        self.top_countries.merge(other.top_countries)
+        self.time_elapsed.merge(other.time_elapsed)
+        return self
+
+    def summary(self, top=5):
+        """
+        Returns unique IP and country estimates, the top sports and countries, and p50/p95/p99 of Time_Elapsed.
+        """
+        return {
+            'unique_ips': self.ips.count(),
+            'unique_countries': self.countries.count(),
+            'top_sports': [[str(item), count] for item, count, _ in self.top_sports.top(top)],
+            'top_countries': [[str(item), count] for item, count, _ in self.top_countries.top(top)],
+            'p50_response_time': self.time_elapsed.quantile(0.5),
+            'p95_response_time': self.time_elapsed.quantile(0.95),
+            'p99_response_time': self.time_elapsed.quantile(0.99),
+        }
+
+    def to_dict(self):
+        return {
+            'rows': self.rows,
+            'ips': self.ips.to_dict(),
+            'countries': self.countries.to_dict(),
+            'top_sports': self.top_sports.to_dict(),
+            'top_countries': self.top_countries.to_dict(),
+            'time_elapsed': self.time_elapsed.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        sketches = cls()
+        sketches.rows = state['rows']
+        sketches.ips = HyperLogLog.from_dict(state['ips'])
+        sketches.countries = HyperLogLog.from_dict(state['countries'])
+        sketches.top_sports = SpaceSaving.from_dict(state['top_sports'])
+        sketches.top_countries = SpaceSaving.from_dict(state['top_countries'])
+        sketches.time_elapsed = TDigest.from_dict(state['time_elapsed'])
+        return sketches
+
+
+class SketchWindow:
+    """
+    LogSketches over a sliding window, kept as one sketch per arriving batch.
+
+    Sketches cannot subtract rows, so the window drops whole batches once the newer
+    ones cover `max_rows`; the oldest batches are merged together when there are more
+    than `max_buckets`, which keeps memory constant however many batches arrive.
+
+    Parameters:
+    max_rows (int): Rows the window should cover, or None to keep everything.
+    max_buckets (int): The most batch sketches kept.
+    """
+
+    def __init__(self, max_rows=None, max_buckets=16):
+        self.max_rows = max_rows
+        self.max_buckets = max_buckets
+        self.buckets = deque()
+
+    def add(self, logs_df):
+        if logs_df.empty:
+            return
+        bucket = LogSketches()
+        bucket.add_frame(logs_df)
+        self.buckets.append(bucket)
+        if self.max_rows is not None:
+            while len(self.buckets) > 1 and sum(b.rows for b in self.buckets) - self.buckets[0].rows >= self.max_rows:
+                self.buckets.popleft()
+        while len(self.buckets) > self.max_buckets:
+            oldest = self.buckets.popleft()
+            self.buckets[0] = oldest.merge(self.buckets[0])
+
+    def clear(self):
+        self.buckets.clear()
+
+    def merged(self):
+        merged = LogSketches()
+        for bucket in self.buckets:
+            merged.merge(bucket)
+        return merged
@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from aggregates import LogAggregates
+from ingest import prepare_logs
+from schema import olympic_countries, sample_user_agents, sports, status_codes
+
+
+# Prepared log frame, as the dashboard window holds it, spread over a few months
+def make_logs(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return prepare_logs(pd.DataFrame({
+        'IP': [f'10.0.{n // 256}.{n % 256}' for n in rng.integers(0, 65536, size=count)],
+        'Country': rng.choice(olympic_countries[:12], size=count),
+        'Timestamp': rng.integers(1_672_531_200, 1_680_307_200, size=count),
+        'Sport': rng.choice(sports[:8], size=count),
+        'Status_Code': rng.choice(status_codes, size=count),
+        'Bytes_Transferred': rng.integers(100, 10_000, size=count),
+        'User_Agent': rng.choice(sample_user_agents, size=count),
+        'Time_Elapsed': rng.integers(1, 1000, size=count),
+    }))
+
+
+class LogAggregatesTest(unittest.TestCase):
+
+    def assert_matches_recount(self, aggregates, window):
+        recount = LogAggregates()
+        recount.add(window)
+        self.assertEqual(aggregates.rows, len(window))
+        self.assertEqual(aggregates.time_elapsed_total, int(window['Time_Elapsed'].sum()))
+        for name in LogAggregates.COUNTERS:
+            with self.subTest(counter=name):
+                pd.testing.assert_series_equal(aggregates.counts(name).sort_index(), recount.counts(name).sort_index())
+        pd.testing.assert_frame_equal(aggregates.heatmap(), recount.heatmap())
+        pd.testing.assert_frame_equal(aggregates.daily_views(), recount.daily_views())
+        pd.testing.assert_frame_equal(aggregates.sport_trend(sports), recount.sport_trend(sports))
+
+    def test_sliding_window_matches_a_recount(self):
+        window_rows = 300
+        aggregates, window = LogAggregates(window_rows), None
+        for seed, count in enumerate([120, 250, 80, 400, 30, 310]):
+            added = make_logs(count, seed=seed)
+            window = added if window is None else pd.concat([window, added], ignore_index=True)
+            evicted, window = window.iloc[:-window_rows], window.iloc[-window_rows:]
+            aggregates.update(added, evicted)
+            self.assert_matches_recount(aggregates, window)
+
+    def test_evicting_everything_empties_the_counters(self):
+        aggregates = LogAggregates()
+        logs = make_logs(200)
+        aggregates.add(logs)
+        aggregates.update(logs.iloc[:0], logs)
+        self.assertEqual(aggregates.rows, 0)
+        for name in LogAggregates.COUNTERS:
+            self.assertTrue(aggregates.counts(name).empty)
+
+    def test_replacing_the_window_resets_the_sketches(self):
+        aggregates = LogAggregates(1000)
+        old, new = make_logs(500, seed=1), make_logs(200, seed=2)
+        aggregates.add(old)
+        aggregates.update(new, old)
+        self.assertEqual(aggregates.sketches.merged().rows, 200)
+        self.assert_matches_recount(aggregates, new)
+
+    def test_sport_counts_for_a_country(self):
+        aggregates = LogAggregates()
+        logs = make_logs(500)
+        aggregates.add(logs)
+        country = logs['Country'].iloc[0]
+        expected = logs.loc[logs['Country'] == country, 'Sport'].value_counts()
+        expected = expected[expected != 0]
+        self.assertEqual(aggregates.sport_counts_for(country).to_dict(), expected.to_dict())
+        self.assertTrue(aggregates.sport_counts_for('Atlantis').empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import threading
+import unittest
+
+import numpy as np
+
+from log_store import ColumnarRingBuffer
+
+DTYPES = {'seq': np.int64, 'value': np.int32}
+
+
+# Batch of `count` rows numbered from `start`, so tests can check which rows a read returned
+def make_batch(start, count):
+    seq = np.arange(start, start + count, dtype=np.int64)
+    return {'seq': seq, 'value': (seq % 1000).astype(np.int32)}
+
+
+class ColumnarRingBufferTest(unittest.TestCase):
+
+    def test_tail_before_wrap(self):
+        store = ColumnarRingBuffer(10, DTYPES)
+        store.append(make_batch(0, 4))
+        self.assertEqual(len(store), 4)
+        np.testing.assert_array_equal(store.tail(10)['seq'], np.arange(4))
+        np.testing.assert_array_equal(store.tail(2)['seq'], [2, 3])
+
+    def test_wrap_around_keeps_newest_rows_in_order(self):
+        store = ColumnarRingBuffer(10, DTYPES)
+        for start in range(0, 25, 5):
+            store.append(make_batch(start, 5))
+        self.assertEqual(len(store), 10)
+        self.assertEqual(store.total_appended, 25)
+        self.assertEqual(store.evicted, 15)
+        np.testing.assert_array_equal(store.tail(10)['seq'], np.arange(15, 25))
+        np.testing.assert_array_equal(store.tail(3)['value'], [22, 23, 24])
+
+    def test_batch_crossing_the_end_of_the_buffer(self):
+        store = ColumnarRingBuffer(10, DTYPES)
+        store.append(make_batch(0, 7))
+        store.append(make_batch(7, 6))
+        np.testing.assert_array_equal(store.tail(10)['seq'], np.arange(3, 13))
+
+    def test_oversize_batch_keeps_only_the_newest_capacity_rows(self):
+        store = ColumnarRingBuffer(10, DTYPES)
+        store.append(make_batch(0, 3))
+        store.append(make_batch(3, 25))
+        self.assertEqual(len(store), 10)
+        self.assertEqual(store.total_appended, 28)
+        np.testing.assert_array_equal(store.tail(10)['seq'], np.arange(18, 28))
+        store.append(make_batch(28, 4))
+        np.testing.assert_array_equal(store.tail(10)['seq'], np.arange(22, 32))
+
+    def test_mismatched_column_lengths_are_rejected(self):
+        store = ColumnarRingBuffer(10, DTYPES)
+        with self.assertRaises(ValueError):
+            store.append({'seq': np.arange(3), 'value': np.arange(2)})
+        self.assertEqual(store.total_appended, 0)
+
+    def test_tail_returns_copies(self):
+        store = ColumnarRingBuffer(10, DTYPES)
+        store.append(make_batch(0, 5))
+        rows = store.tail(5)
+        store.append(make_batch(5, 10))
+        np.testing.assert_array_equal(rows['seq'], np.arange(5))
+
+
+class SinceTest(unittest.TestCase):
+
+    def setUp(self):
+        self.store = ColumnarRingBuffer(100, DTYPES)
+        self.store.append(make_batch(0, 30))
+
+    def test_since_returns_rows_from_the_cursor(self):
+        columns, first_seq, next_seq = self.store.since(25)
+        np.testing.assert_array_equal(columns['seq'], np.arange(25, 30))
+        self.assertEqual((first_seq, next_seq), (25, 30))
+
+    def test_since_at_the_head_is_empty(self):
+        columns, first_seq, next_seq = self.store.since(30)
+        self.assertEqual(len(columns['seq']), 0)
+        self.assertEqual((first_seq, next_seq), (30, 30))
+
+    def test_cursor_ahead_of_the_store_is_empty(self):
+        columns, first_seq, next_seq = self.store.since(50)
+        self.assertEqual(len(columns['seq']), 0)
+        self.assertEqual(next_seq, 30)
+
+    def test_limit_keeps_the_newest_rows(self):
+        columns, first_seq, next_seq = self.store.since(0, limit=10)
+        np.testing.assert_array_equal(columns['seq'], np.arange(20, 30))
+        self.assertEqual((first_seq, next_seq), (20, 30))
+
+    def test_evicted_rows_are_skipped(self):
+        self.store.append(make_batch(30, 120))
+        columns, first_seq, next_seq = self.store.since(10)
+        self.assertEqual(first_seq, self.store.first_seq)
+        self.assertEqual(first_seq, 50)
+        np.testing.assert_array_equal(columns['seq'], np.arange(50, 150))
+        self.assertEqual(next_seq, 150)
+
+    def test_cursor_stays_continuous_with_a_concurrent_writer(self):
+        store = ColumnarRingBuffer(1_000_000, DTYPES)
+        done = threading.Event()
+
+        def write():
+            start = 0
+            for count in np.random.default_rng(0).integers(1, 500, size=2000):
+                store.append(make_batch(start, int(count)))
+                start += int(count)
+            done.set()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        cursor, received = 0, []
+        while True:
+            finished = done.is_set()
+            columns, first_seq, next_seq = store.since(cursor)
+            # The rows returned are exactly first_seq..next_seq, starting at the cursor
+            self.assertEqual(first_seq, cursor)
+            np.testing.assert_array_equal(columns['seq'], np.arange(first_seq, next_seq))
+            received.append(columns['seq'])
+            cursor = next_seq
+            if finished:
+                break
+        writer.join()
+        np.testing.assert_array_equal(np.concatenate(received), np.arange(store.total_appended))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import gzip
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import log_wire
+from schema import apply_schema, olympic_countries, sample_user_agents, sports, status_codes
+
+
+# Log frame with the server's column layout and categorical dtypes
+def make_logs(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return apply_schema(pd.DataFrame({
+        'IP': [f'10.0.{n // 256}.{n % 256}' for n in rng.integers(0, 65536, size=count)],
+        'Country': rng.choice(olympic_countries, size=count),
+        'Timestamp': rng.integers(1_672_531_200, 1_704_067_200, size=count),
+        'Sport': rng.choice(sports, size=count),
+        'Status_Code': rng.choice(status_codes, size=count),
+        'Bytes_Transferred': rng.integers(100, 10_000, size=count).astype(np.int32),
+        'User_Agent': rng.choice(sample_user_agents, size=count),
+        'Time_Elapsed': rng.integers(1, 1000, size=count).astype(np.int32),
+    }))
+
+
+# Encode and decode a frame, reapplying the schema the JSON formats cannot carry
+def round_trip(frame, mimetype, chunk_size=log_wire.CHUNK_SIZE):
+    content = b''.join(log_wire.encode_frame(frame, mimetype, chunk_size))
+    return apply_schema(log_wire.decode_frame(content, mimetype))
+
+
+class WireFormatTest(unittest.TestCase):
+
+    def test_every_format_round_trips(self):
+        logs = make_logs(50)
+        for mimetype in log_wire.supported_formats():
+            with self.subTest(mimetype=mimetype):
+                # JSON widens integers to int64; Arrow keeps every dtype
+                pd.testing.assert_frame_equal(round_trip(logs, mimetype), logs,
+                                              check_dtype=mimetype == log_wire.ARROW_STREAM)
+
+    def test_streamed_formats_round_trip_across_chunks(self):
+        logs = make_logs(23)
+        for mimetype in (log_wire.NDJSON, log_wire.ARROW_STREAM):
+            if mimetype not in log_wire.supported_formats():
+                continue
+            with self.subTest(mimetype=mimetype):
+                self.assertGreater(len(list(log_wire.encode_frame(logs, mimetype, chunk_size=5))), 2)
+                pd.testing.assert_frame_equal(round_trip(logs, mimetype, chunk_size=5), logs, check_dtype=False)
+
+    def test_empty_body_decodes_to_an_empty_frame(self):
+        for mimetype in log_wire.supported_formats():
+            self.assertTrue(log_wire.decode_frame(b'', mimetype).empty)
+
+    def test_mimetype_parameters_are_ignored(self):
+        logs = make_logs(5)
+        content = b''.join(log_wire.encode_frame(logs, log_wire.NDJSON))
+        decoded = apply_schema(log_wire.decode_frame(content, log_wire.NDJSON + '; charset=utf-8'))
+        pd.testing.assert_frame_equal(decoded, logs, check_dtype=False)
+
+    def test_unknown_format_is_rejected(self):
+        with self.assertRaises(ValueError):
+            log_wire.encode_frame(make_logs(1), 'text/csv')
+
+    def test_accept_header_prefers_the_first_preferred_format(self):
+        header = log_wire.accept_header()
+        self.assertEqual(header.split(',')[0], f'{log_wire.preferred_formats()[0]};q=1.0')
+        self.assertNotIn(log_wire.COLUMNS_JSON, header)
+
+    def test_gzip_stream_decompresses_to_the_body(self):
+        chunks = list(log_wire.encode_frame(make_logs(40), log_wire.NDJSON, chunk_size=10))
+        compressed = b''.join(log_wire.compress_chunks(iter(chunks), 'gzip'))
+        self.assertEqual(gzip.decompress(compressed), b''.join(chunks))
+
+
+if __name__ == '__main__':
+    unittest.main()
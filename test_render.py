@@ -0,0 +1,64 @@
+import unittest
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from render import PanelRenderer, fingerprint
+
+
+# Draws a pie for counts A, then B, then A again into one placeholder, as the dashboard loop does
+def redraw_app():
+    import pandas as pd
+    import plotly.express as px
+    import streamlit as st
+
+    from render import PanelRenderer
+
+    renderer = PanelRenderer()
+    placeholder = st.empty()
+    first = pd.Series([60, 30, 10], index=['200', '404', '500'])
+    second = pd.Series([59, 31, 10], index=['200', '404', '500'])
+    for counts in (first, second, first):
+        if renderer.changed('status', counts):
+            with placeholder.container():
+                st.plotly_chart(px.pie(values=counts.values, names=counts.index), key=renderer.key('status'))
+
+
+class PanelRendererTest(unittest.TestCase):
+
+    def test_unchanged_inputs_are_not_redrawn(self):
+        renderer = PanelRenderer()
+        counts = pd.Series([3, 2], index=['a', 'b'])
+        self.assertTrue(renderer.changed('panel', counts))
+        self.assertFalse(renderer.changed('panel', counts.copy()))
+        self.assertTrue(renderer.changed('panel', counts + 1))
+
+    def test_each_draw_gets_its_own_key(self):
+        renderer = PanelRenderer()
+        first, second = pd.Series([3, 2]), pd.Series([2, 3])
+        keys = []
+        for counts in (first, second, first):
+            self.assertTrue(renderer.changed('status', counts))
+            keys.append(renderer.key('status'))
+        self.assertEqual(len(set(keys)), 3)
+
+    def test_keys_stay_unique_after_reset(self):
+        renderer = PanelRenderer()
+        renderer.changed('status', 1)
+        before = renderer.key('status')
+        renderer.reset()
+        renderer.changed('status', 1)
+        self.assertNotEqual(renderer.key('status'), before)
+
+    def test_fingerprint_depends_on_values_and_labels(self):
+        counts = pd.Series([3, 2], index=['a', 'b'])
+        self.assertEqual(fingerprint(counts), fingerprint(counts.copy()))
+        self.assertNotEqual(fingerprint(counts), fingerprint(counts.set_axis(['b', 'a'])))
+
+    def test_identical_chart_after_a_different_one_renders(self):
+        app = AppTest.from_function(redraw_app).run()
+        self.assertFalse(app.exception)
+
+
+if __name__ == '__main__':
+    unittest.main()
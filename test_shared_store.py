@@ -0,0 +1,111 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import numpy as np
+
+from log_store import SharedRingBuffer
+
+DTYPES = {'seq': np.int64, 'double': np.int64, 'small': np.int32}
+
+
+# Batch of `count` rows numbered from `start`; every row has double == 2 * seq
+def make_batch(start, count):
+    seq = np.arange(start, start + count, dtype=np.int64)
+    return {'seq': seq, 'double': seq * 2, 'small': (seq % 1000).astype(np.int32)}
+
+
+class SharedRingBufferTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'logs')
+        self.writer = SharedRingBuffer(self.path, DTYPES, capacity=100, create=True)
+
+    def test_reader_sees_the_writers_rows(self):
+        reader = SharedRingBuffer(self.path, DTYPES)
+        self.writer.append(make_batch(0, 130))
+        self.assertEqual(reader.capacity, 100)
+        self.assertEqual(len(reader), 100)
+        self.assertEqual(reader.total_appended, 130)
+        columns, first_seq, next_seq = reader.since(120)
+        np.testing.assert_array_equal(columns['seq'], np.arange(120, 130))
+        self.assertEqual((first_seq, next_seq), (120, 130))
+
+    def test_reader_cannot_append(self):
+        reader = SharedRingBuffer(self.path, DTYPES)
+        with self.assertRaises(PermissionError):
+            reader.append(make_batch(0, 1))
+
+    def test_create_resets_the_segment(self):
+        self.writer.append(make_batch(0, 10))
+        SharedRingBuffer(self.path, DTYPES, capacity=50, create=True)
+        reader = SharedRingBuffer(self.path, DTYPES)
+        self.assertEqual((reader.capacity, len(reader), reader.total_appended), (50, 0, 0))
+
+    def test_create_needs_a_capacity(self):
+        with self.assertRaises(ValueError):
+            SharedRingBuffer(self.path, DTYPES, create=True)
+
+    def test_attach_rejects_other_files(self):
+        other = self.path + '-other'
+        with open(other, 'wb') as segment:
+            segment.write(b'\0' * 4096)
+        self.addCleanup(os.unlink, other)
+        with self.assertRaisesRegex(ValueError, 'not a log store segment'):
+            SharedRingBuffer(other, DTYPES)
+
+    def test_attach_rejects_a_different_column_count(self):
+        with self.assertRaisesRegex(ValueError, 'columns'):
+            SharedRingBuffer(self.path, {'seq': np.int64, 'double': np.int64})
+
+    def test_attach_rejects_a_different_dtype(self):
+        # Swapping widths keeps the segment size, so only the stored dtypes can tell
+        swapped = {'seq': np.int64, 'double': np.int32, 'small': np.int64}
+        with self.assertRaisesRegex(ValueError, 'stores column double as <i8'):
+            SharedRingBuffer(self.path, swapped)
+
+    def test_attach_rejects_a_truncated_segment(self):
+        with open(self.path, 'r+b') as segment:
+            segment.truncate(os.path.getsize(self.path) - 64)
+        with self.assertRaisesRegex(ValueError, 'layout'):
+            SharedRingBuffer(self.path, DTYPES)
+
+    def test_read_times_out_when_the_writer_died_mid_append(self):
+        reader = SharedRingBuffer(self.path, DTYPES)
+        reader.READ_TIMEOUT = 0.05
+        # A writer killed between _begin_write and _end_write leaves the version odd
+        self.writer._begin_write()
+        with self.assertRaises(TimeoutError):
+            reader.tail(1)
+
+    def test_reads_are_consistent_during_writes(self):
+        # The reader has its own mapping and no lock shared with the writer, as in another process
+        reader = SharedRingBuffer(self.path, DTYPES)
+        done = threading.Event()
+
+        def write():
+            start = 0
+            for count in np.random.default_rng(0).integers(1, 150, size=3000):
+                self.writer.append(make_batch(start, int(count)))
+                start += int(count)
+            done.set()
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        reads = 0
+        while not done.is_set() or reads == 0:
+            columns, first_seq, next_seq = reader.since(0)
+            # A torn read would mix rows from different appends or disagree with the header
+            np.testing.assert_array_equal(columns['seq'], np.arange(first_seq, next_seq))
+            np.testing.assert_array_equal(columns['double'], columns['seq'] * 2)
+            self.assertEqual(next_seq - first_seq, min(next_seq, reader.capacity))
+            reads += 1
+        writer.join()
+        self.assertEqual(reader.total_appended, self.writer.total_appended)
+
+
+if __name__ == '__main__':
+    unittest.main()
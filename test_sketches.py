@@ -0,0 +1,204 @@
+import json
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from schema import COUNTRY_DTYPE, olympic_countries, sports
+from sketches import HyperLogLog, LogSketches, SketchWindow, SpaceSaving, TDigest
+
+
+# Round-trip a sketch through JSON, as the log server sends it
+def round_trip(sketch):
+    return type(sketch).from_dict(json.loads(json.dumps(sketch.to_dict())))
+
+
+# Log-like frame with `count` rows and about `ips` distinct IPs
+def make_logs(count, ips, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'IP': [f'10.0.{n // 256}.{n % 256}' for n in rng.integers(0, ips, size=count)],
+        'Country': pd.Categorical(rng.choice(['Kenya', 'Japan', 'Brazil'], size=count, p=[0.6, 0.3, 0.1])),
+        'Sport': pd.Categorical(rng.choice(['Rowing', 'Judo'], size=count)),
+        'Time_Elapsed': rng.integers(1, 1000, size=count),
+    })
+
+
+class HyperLogLogTest(unittest.TestCase):
+
+    def test_count_is_within_a_few_percent(self):
+        sketch = HyperLogLog()
+        sketch.update(np.arange(50_000))
+        self.assertAlmostEqual(sketch.count(), 50_000, delta=50_000 * 0.05)
+
+    def test_small_counts_are_exact_enough(self):
+        sketch = HyperLogLog()
+        sketch.update(np.array(['a', 'b', 'c', 'a']))
+        self.assertEqual(sketch.count(), 3)
+
+    def test_merge_matches_the_union(self):
+        left, right, union = HyperLogLog(), HyperLogLog(), HyperLogLog()
+        left.update(np.arange(0, 30_000))
+        right.update(np.arange(20_000, 50_000))
+        union.update(np.arange(0, 50_000))
+        self.assertEqual(left.merge(right).count(), union.count())
+
+    def test_merge_rejects_other_precisions(self):
+        with self.assertRaises(ValueError):
+            HyperLogLog(10).merge(HyperLogLog(12))
+
+    def test_round_trip(self):
+        sketch = HyperLogLog()
+        sketch.update(np.arange(1000))
+        restored = round_trip(sketch)
+        self.assertEqual(restored.precision, sketch.precision)
+        np.testing.assert_array_equal(restored.registers, sketch.registers)
+
+    def test_categorical_hashes_like_its_values(self):
+        values = np.array(['Kenya', 'Japan', 'Kenya', 'Brazil'])
+        plain, categorical = HyperLogLog(), HyperLogLog()
+        plain.update(values)
+        categorical.update(pd.Series(pd.Categorical(values)))
+        np.testing.assert_array_equal(plain.registers, categorical.registers)
+
+
+class SpaceSavingTest(unittest.TestCase):
+
+    def test_exact_below_capacity(self):
+        sketch = SpaceSaving(capacity=8)
+        sketch.update(['a'] * 5 + ['b'] * 3 + ['c'])
+        self.assertEqual(sketch.top(2), [('a', 5, 0), ('b', 3, 0)])
+
+    def test_heavy_hitters_survive_a_long_tail(self):
+        sketch = SpaceSaving(capacity=10)
+        sketch.update(['hot'] * 1000 + [f'cold{n}' for n in range(500)])
+        item, count, error = sketch.top(1)[0]
+        self.assertEqual(item, 'hot')
+        self.assertGreaterEqual(count, 1000)
+        self.assertLessEqual(count - error, 1000)
+        self.assertLessEqual(len(sketch.counts), 10)
+
+    def test_batch_heavy_hitter_is_counted_exactly(self):
+        # The heavy item comes last in category order; it must not inherit the light items' counts
+        categories = [f'light{n:02d}' for n in range(50)] + ['zheavy']
+        values = pd.Categorical(['zheavy'] * 1000 + categories[:50], categories=categories)
+        sketch = SpaceSaving(capacity=10)
+        sketch.update(values)
+        self.assertEqual(sketch.top(1), [('zheavy', 1000, 0)])
+
+    def test_merge_adds_counts(self):
+        left, right = SpaceSaving(), SpaceSaving()
+        left.update(['a', 'a', 'b'])
+        right.update(['a', 'c'])
+        self.assertEqual(dict((item, count) for item, count, _ in left.merge(right).top(3)), {'a': 3, 'b': 1, 'c': 1})
+
+    def test_round_trip(self):
+        sketch = SpaceSaving(capacity=4)
+        sketch.update(['a'] * 3 + ['b', 'c', 'd', 'e'])
+        restored = round_trip(sketch)
+        self.assertEqual(restored.capacity, 4)
+        self.assertEqual(restored.top(4), sketch.top(4))
+
+
+class TDigestTest(unittest.TestCase):
+
+    def test_quantiles_of_a_uniform_distribution(self):
+        sketch = TDigest()
+        sketch.update(np.random.default_rng(0).uniform(0, 1000, size=100_000))
+        for q in (0.5, 0.95, 0.99):
+            self.assertAlmostEqual(sketch.quantile(q), q * 1000, delta=10)
+        self.assertLessEqual(len(sketch.means), 2 * sketch.compression)
+
+    def test_empty_digest_has_no_quantiles(self):
+        self.assertIsNone(TDigest().quantile(0.5))
+
+    def test_merge_matches_a_single_digest(self):
+        values = np.random.default_rng(1).exponential(100, size=40_000)
+        left, right, whole = TDigest(), TDigest(), TDigest()
+        left.update(values[:15_000])
+        right.update(values[15_000:])
+        whole.update(values)
+        merged = left.merge(right)
+        self.assertEqual(merged.total, whole.total)
+        self.assertEqual((merged.min, merged.max), (whole.min, whole.max))
+        for q in (0.5, 0.95, 0.99):
+            self.assertAlmostEqual(merged.quantile(q), np.quantile(values, q), delta=np.quantile(values, q) * 0.03)
+
+    def test_round_trip(self):
+        sketch = TDigest()
+        sketch.update(np.arange(1, 5001))
+        restored = round_trip(sketch)
+        np.testing.assert_array_equal(restored.means, sketch.means)
+        np.testing.assert_array_equal(restored.weights, sketch.weights)
+        self.assertEqual(restored.quantile(0.99), sketch.quantile(0.99))
+
+    def test_round_trip_of_an_empty_digest(self):
+        self.assertIsNone(round_trip(TDigest()).quantile(0.5))
+
+
+class LogSketchesTest(unittest.TestCase):
+
+    def test_merge_of_halves_matches_the_whole(self):
+        logs = make_logs(4000, ips=1500)
+        first, second, whole = LogSketches(), LogSketches(), LogSketches()
+        first.add_frame(logs.iloc[:1000])
+        second.add_frame(logs.iloc[1000:])
+        whole.add_frame(logs)
+        merged = first.merge(second)
+        self.assertEqual(merged.rows, 4000)
+        self.assertEqual(merged.ips.count(), whole.ips.count())
+        self.assertEqual(merged.summary()['top_countries'], whole.summary()['top_countries'])
+
+    def test_top_countries_are_exact_over_the_full_vocabulary(self):
+        # Close to uniform over all 100 countries, as the generator produces
+        rng = np.random.default_rng(2)
+        sketches, batches = LogSketches(), []
+        for _ in range(50):
+            batch = pd.DataFrame({
+                'IP': rng.integers(0, 2**32, size=5000),
+                'Country': pd.Categorical(rng.choice(olympic_countries, size=5000), dtype=COUNTRY_DTYPE),
+                'Sport': pd.Categorical(rng.choice(sports, size=5000)),
+                'Time_Elapsed': rng.integers(1, 1000, size=5000),
+            })
+            sketches.add_frame(batch)
+            batches.append(batch)
+        true_counts = pd.concat(batches)['Country'].value_counts()
+        for country, count, error in sketches.top_countries.top(10):
+            self.assertEqual(error, 0)
+            self.assertEqual(count, true_counts[country])
+        self.assertEqual(sketches.top_countries.top(1)[0][1], true_counts.iloc[0])
+
+    def test_round_trip_keeps_the_summary(self):
+        sketches = LogSketches()
+        sketches.add_frame(make_logs(2000, ips=800))
+        restored = round_trip(sketches)
+        self.assertEqual(restored.rows, sketches.rows)
+        self.assertEqual(restored.summary(), sketches.summary())
+
+
+class SketchWindowTest(unittest.TestCase):
+
+    def test_old_batches_leave_the_window(self):
+        window = SketchWindow(max_rows=1000)
+        for seed in range(10):
+            window.add(make_logs(500, ips=100_000, seed=seed))
+        merged = window.merged()
+        self.assertLessEqual(merged.rows, 1500)
+        self.assertGreaterEqual(merged.rows, 1000)
+
+    def test_buckets_are_merged_beyond_max_buckets(self):
+        window = SketchWindow(max_buckets=4)
+        for seed in range(10):
+            window.add(make_logs(100, ips=50, seed=seed))
+        self.assertEqual(len(window.buckets), 4)
+        self.assertEqual(window.merged().rows, 1000)
+
+    def test_clear(self):
+        window = SketchWindow()
+        window.add(make_logs(100, ips=50))
+        window.clear()
+        self.assertEqual(window.merged().rows, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
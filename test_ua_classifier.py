@@ -0,0 +1,56 @@
+import unittest
+
+import pandas as pd
+
+from schema import USER_AGENT_DTYPE, sample_user_agents
+from ua_classifier import BROWSERS, DEVICES, classify_user_agent, classify_user_agents
+
+# (device, browser) for each of schema.sample_user_agents, in order
+EXPECTED = [
+    ('Windows', 'Firefox'),
+    ('Windows', 'Chrome'),
+    ('Mac', 'Safari'),
+    ('iPhone', 'Safari'),
+    ('iPad', 'Safari'),
+    ('Android', 'Chrome'),
+    ('Android', 'Chrome'),
+    ('Windows', 'Opera'),
+    ('Windows', 'Edge'),
+    ('iPhone', 'Firefox'),
+    ('iPad', 'Firefox'),
+]
+
+
+class ClassifyUserAgentTest(unittest.TestCase):
+
+    def test_every_sample_user_agent(self):
+        self.assertEqual(len(EXPECTED), len(sample_user_agents))
+        for user_agent, expected in zip(sample_user_agents, EXPECTED):
+            with self.subTest(user_agent=user_agent):
+                self.assertEqual(classify_user_agent(user_agent), expected)
+
+    def test_unknown_user_agent(self):
+        self.assertEqual(classify_user_agent('curl/8.4.0'), ('Other', 'Other'))
+
+
+class ClassifyUserAgentsTest(unittest.TestCase):
+
+    def test_column_matches_the_single_classifier(self):
+        user_agents = pd.Series(sample_user_agents * 3, index=range(100, 100 + 3 * len(sample_user_agents)))
+        devices, browsers = classify_user_agents(user_agents)
+        self.assertEqual(list(devices.index), list(user_agents.index))
+        self.assertEqual(list(zip(devices, browsers)), EXPECTED * 3)
+        self.assertEqual(list(devices.cat.categories), DEVICES)
+        self.assertEqual(list(browsers.cat.categories), BROWSERS)
+
+    def test_categorical_column_with_a_missing_value(self):
+        values = [sample_user_agents[8], None, sample_user_agents[3], sample_user_agents[8]]
+        devices, browsers = classify_user_agents(pd.Series(values, dtype=USER_AGENT_DTYPE))
+        self.assertEqual(devices.isna().tolist(), [False, True, False, False])
+        self.assertEqual(browsers.isna().tolist(), [False, True, False, False])
+        self.assertEqual(devices.dropna().tolist(), ['Windows', 'iPhone', 'Windows'])
+        self.assertEqual(browsers.dropna().tolist(), ['Edge', 'Safari', 'Edge'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Device rules, checked in order. Mobile platforms come first because iPhone and
+# iPad user agents also contain "Mac OS X".
+DEVICE_RULES = [
+    ('iPhone', re.compile(r'iPhone')),
+    ('iPad', re.compile(r'iPad')),
+    ('Android', re.compile(r'Android')),
+    ('Windows', re.compile(r'Windows|Win')),
+    ('Mac', re.compile(r'Macintosh|Mac OS')),
+]
+
+# Browser rules, checked in order. Edge and Opera user agents also contain
+# "Chrome" and "Safari", and Chrome and Firefox on iOS contain "Safari", so the
+# more specific tokens are matched first.
+BROWSER_RULES = [
+    ('Edge', re.compile(r'Edg(e|A|iOS)?/')),
+    ('Opera', re.compile(r'OPR/|Opera')),
+    ('Firefox', re.compile(r'Firefox|FxiOS')),
+    ('Chrome', re.compile(r'Chrome|CriOS')),
+    ('Safari', re.compile(r'Safari')),
+]
+
+DEVICES = [name for name, _ in DEVICE_RULES] + ['Other']
+BROWSERS = [name for name, _ in BROWSER_RULES] + ['Other']
+
+# Upper bound on distinct user agents remembered by classify_user_agent
+UA_CACHE_SIZE = 1024
+
+
+def _match(rules, user_agent):
+    for name, pattern in rules:
+        if pattern.search(user_agent):
+            return name
+    return 'Other'
+
+
+@lru_cache(maxsize=UA_CACHE_SIZE)
+def classify_user_agent(user_agent):
+    """
+    Classifies a user agent string.
+
+    Returns:
+    tuple: (device, browser)
+    """
+    return _match(DEVICE_RULES, user_agent), _match(BROWSER_RULES, user_agent)
+
+
+def extract_device(user_agent):
+    return classify_user_agent(user_agent)[0]
+
+
+def extract_browser(user_agent):
+    return classify_user_agent(user_agent)[1]
+
+
+def classify_user_agents(user_agents):
+    """
+    Classifies a column of user agents, parsing each distinct string only once.
+
+    Parameters:
+    user_agents (pd.Series): User agent strings.
+
+    Returns:
+    tuple: (devices, browsers) as categorical Series aligned with the input.
+    """
+    codes, uniques = pd.factorize(user_agents)
+    parsed = [classify_user_agent(user_agent) for user_agent in uniques]
+    # A trailing -1 makes factorize's -1 (missing user agent) map to a missing category
+    device_lookup = np.append(pd.Index(DEVICES).get_indexer([device for device, _ in parsed]), -1)
+    browser_lookup = np.append(pd.Index(BROWSERS).get_indexer([browser for _, browser in parsed]), -1)
+    devices = pd.Categorical.from_codes(device_lookup[codes], categories=DEVICES)
+    browsers = pd.Categorical.from_codes(browser_lookup[codes], categories=BROWSERS)
+    return (pd.Series(devices, index=user_agents.index, name='Device'),
+            pd.Series(browsers, index=user_agents.index, name='Browser'))